@@ -0,0 +1,103 @@
+"""Sync (threadpool + psycopg2) ve async (asyncpg) veritabanı yollarını karşılaştırır.
+
+Yerel Postgres'e karşı çalışır:
+
+    python benchmarks/async_vs_sync.py --istek 5000 --eszamanli 200
+
+Sync yol, Starlette'in varsayılan threadpool boyutu (40) ile crud.get_odevler'i
+çalıştırır; async yol aynı sorguyu crud_async.get_odevler ile event loop
+üzerinde çalıştırır. Sonuç JSON olarak basılır: istek/sn, p50 ve p99 gecikme.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crud
+import crud_async
+import database
+import schemas
+
+STARLETTE_THREADPOOL = 40
+
+
+def _ozet(ad, sureler, toplam_sure):
+    sureler = sorted(sureler)
+    return {
+        "yol": ad,
+        "istek": len(sureler),
+        "istek_sn": round(len(sureler) / toplam_sure, 1),
+        "p50_ms": round(sureler[len(sureler) // 2] * 1000, 2),
+        "p99_ms": round(sureler[int(len(sureler) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def _sync_istek(limit):
+    baslangic = time.perf_counter()
+    db = database.SessionLocal()
+    try:
+        odevler = crud.get_odevler(db, limit=limit)
+        [schemas.Odev.model_validate(o) for o in odevler]
+    finally:
+        db.close()
+    return time.perf_counter() - baslangic
+
+
+async def sync_yol(istek, eszamanli, limit):
+    loop = asyncio.get_running_loop()
+    sinir = asyncio.Semaphore(eszamanli)
+    havuz = ThreadPoolExecutor(max_workers=STARLETTE_THREADPOOL)
+
+    async def tek():
+        async with sinir:
+            # Kuyrukta bekleme süresi de gecikmeye dahil
+            baslangic = time.perf_counter()
+            await loop.run_in_executor(havuz, _sync_istek, limit)
+            return time.perf_counter() - baslangic
+
+    baslangic = time.perf_counter()
+    sureler = await asyncio.gather(*(tek() for _ in range(istek)))
+    toplam = time.perf_counter() - baslangic
+    havuz.shutdown()
+    return _ozet("sync", sureler, toplam)
+
+
+async def async_yol(istek, eszamanli, limit):
+    sinir = asyncio.Semaphore(eszamanli)
+
+    async def tek():
+        async with sinir:
+            baslangic = time.perf_counter()
+            async with database.AsyncSessionLocal() as db:
+                odevler = await crud_async.get_odevler(db, limit=limit)
+                [schemas.Odev.model_validate(o) for o in odevler]
+            return time.perf_counter() - baslangic
+
+    baslangic = time.perf_counter()
+    sureler = await asyncio.gather(*(tek() for _ in range(istek)))
+    toplam = time.perf_counter() - baslangic
+    await database.async_engine.dispose()
+    return _ozet("async", sureler, toplam)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--istek", type=int, default=2000)
+    parser.add_argument("--eszamanli", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    sonuclar = [
+        asyncio.run(sync_yol(args.istek, args.eszamanli, args.limit)),
+        asyncio.run(async_yol(args.istek, args.eszamanli, args.limit)),
+    ]
+    print(json.dumps(sonuclar, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
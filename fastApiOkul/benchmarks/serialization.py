@@ -0,0 +1,77 @@
+"""Liste yanıtı serileştirme mikrobenchmark'ı (veritabanı gerekmez).
+
+FastAPI'nin response_model yolu (Pydantic model_validate + jsonable_encoder +
+JSONResponse) ile hizli_json yolunu aynı ORM nesneleri üzerinde karşılaştırır.
+İki çıktı aynı JSON değerine çözülmüyorsa sıfırdan farklı kodla çıkar:
+
+    python benchmarks/serialization.py [--satir 100] [--tekrar 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import hizli_json
+import models
+import schemas
+
+
+def satirlar_uret(n):
+    simdi = datetime(2024, 9, 1, 8, 30, 15, 123456)
+    return [
+        models.Odev(
+            id=i, baslik=f"Ödev {i} — çalışma kağıdı", aciklama="Sayfa 12-14 arası soruları çözünüz.\n" * 5,
+            teslim_tarihi=simdi + timedelta(days=i % 30), olusturma_tarihi=simdi,
+            durum="beklemede", notlar=None, koc_id=1 + i % 7, ogrenci_id=1 + i % 50,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def pydantic_yolu(satirlar):
+    modeller = [schemas.Odev.model_validate(o) for o in satirlar]
+    return JSONResponse(jsonable_encoder(modeller)).body
+
+
+def hizli_yol(serializer, satirlar):
+    return hizli_json.HizliJSONResponse(serializer.liste(satirlar)).body
+
+
+def olc(fn, tekrar):
+    baslangic = time.perf_counter()
+    for _ in range(tekrar):
+        fn()
+    return time.perf_counter() - baslangic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--satir", type=int, default=100, help="Sayfa başına satır")
+    parser.add_argument("--tekrar", type=int, default=200)
+    args = parser.parse_args()
+
+    satirlar = satirlar_uret(args.satir)
+    serializer = hizli_json.Serializer(schemas.Odev)
+    # Float yazımı motorlar arasında farklı olabildiği için byte değil değer karşılaştırılır
+    if json.loads(pydantic_yolu(satirlar)) != json.loads(hizli_yol(serializer, satirlar)):
+        print("HATA: hızlı yolun çıktısı response_model çıktısından farklı")
+        return 1
+
+    toplam = args.satir * args.tekrar
+    eski = olc(lambda: pydantic_yolu(satirlar), args.tekrar)
+    yeni = olc(lambda: hizli_yol(serializer, satirlar), args.tekrar)
+    motor = "orjson" if hizli_json.orjson is not None else "json"
+    print(f"response_model      : {toplam / eski:>12,.0f} satır/sn")
+    print(f"hizli_json ({motor:6}): {toplam / yeni:>12,.0f} satır/sn  ({eski / yeni:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException,status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 from datetime import timedelta, datetime
 import models
 import schemas
+import pagination
 from security import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token, get_current_koc, get_current_ogrenci
-from passlib.context import CryptContext
+from security import pwd_context, get_password_hash, verify_password
 from typing import List, Optional
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
-
 def get_koc_by_id(db: Session, koc_id: int):
-    return db.query(models.Koc).filter(models.Koc.id == koc_id).first()
+    return db.query(models.Koc).options(joinedload(models.Koc.ogrenciler)).filter(models.Koc.id == koc_id).first()
 
 def create_koc(db: Session, koc: schemas.KocCreate):
-    hashed_password = pwd_context.hash(koc.sifre)
+    hashed_password = get_password_hash(koc.sifre)
     db_koc = models.Koc(
         email=koc.email,
         ad=koc.ad,
@@ -34,6 +27,21 @@ def create_koc(db: Session, koc: schemas.KocCreate):
 def get_koc_by_email(db: Session, email: str):
     return db.query(models.Koc).filter(models.Koc.email == email).first()
 
+def _sayfa(query, sort_col, id_col, skip: int, limit: int, cursor: Optional[str]):
+    """cursor verilirse keyset, verilmezse offset sayfalama uygular"""
+    if cursor is None:
+        return pagination.order_keyset(query, sort_col, id_col).offset(skip).limit(limit).all()
+    rows = []
+    for q in pagination.keyset_queries(query, sort_col, id_col, cursor):
+        rows += q.limit(limit - len(rows)).all()
+        if len(rows) >= limit:
+            break
+    return rows
+
+def get_koclar(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Koc).options(selectinload(models.Koc.ogrenciler))
+    return _sayfa(query, models.Koc.email, models.Koc.id, skip, limit, cursor)
+
 # 🟢 Öğrenci CRUD Fonksiyonları
 def get_ogrenci_by_id(db: Session, ogrenci_id: int):
     return db.query(models.Ogrenci).filter(models.Ogrenci.id == ogrenci_id).first()
@@ -47,11 +55,11 @@ def get_ogrenci_by_email(db: Session, email: str):
 def get_ogrenci_by_no(db: Session, ogrenci_no: str):
     return db.query(models.Ogrenci).filter(models.Ogrenci.ogrenci_no == ogrenci_no).first()
 
-def get_ogrenciler(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Ogrenci).offset(skip).limit(limit).all()
+def get_ogrenciler(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    return _sayfa(db.query(models.Ogrenci), models.Ogrenci.ogrenciNo, models.Ogrenci.id, skip, limit, cursor)
 
 def create_ogrenci(db: Session, ogrenci: schemas.OgrenciCreate):
-    hashed_password = pwd_context.hash(ogrenci.sifre)
+    hashed_password = get_password_hash(ogrenci.sifre)
     db_ogrenci = models.Ogrenci(
         ogrenci_no=ogrenci.ogrenci_no,
         ad=ogrenci.ad,
@@ -139,13 +147,7 @@ def koc_ogrenci_cikar(db: Session, koc_id: int, ogrenci_id: int):
     return koc
 
 # 🟢 Ödev CRUD İşlemleri
-def create_odev(db: Session, odev: schemas.OdevCreate):
-    db_odev = models.Odev(**odev.dict())
-    db.add(db_odev)
-    db.commit()
-    db.refresh(db_odev)
-    return db_odev
-
+# Ödev yazmaları yalnızca crud_async'te: liste sürümleri ve pano sayaçları aynı transaction'da güncellenmeli
 def get_odev(db: Session, odev_id: int):
     return db.query(models.Odev).filter(models.Odev.id == odev_id).first()
 
@@ -155,46 +157,26 @@ def get_ogrenci_odevler(db: Session, ogrenci_id: int):
 def get_koc_odevler(db: Session, koc_id: int):
     return db.query(models.Odev).filter(models.Odev.koc_id == koc_id).all()
 
-def update_odev_tamamlandi(db: Session, odev_id: int, tamamlandi: bool):
-    db_odev = get_odev(db, odev_id)
-    if db_odev:
-        db_odev.tamamlandi = tamamlandi
-        db.commit()
-        db.refresh(db_odev)
-    return db_odev
-
 def get_odevler(
     db: Session,
     skip: int = 0,
     limit: int = 100,
     koc_id: Optional[int] = None,
-    ogrenci_id: Optional[int] = None
+    ogrenci_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    ozet: bool = False
 ):
     query = db.query(models.Odev)
+    if ozet:
+        query = query.options(load_only(*models.ODEV_OZET_KOLONLARI))
     if koc_id:
         query = query.filter(models.Odev.koc_id == koc_id)
     if ogrenci_id:
         query = query.filter(models.Odev.ogrenci_id == ogrenci_id)
-    return query.offset(skip).limit(limit).all()
+    return _sayfa(query, models.Odev.teslim_tarihi, models.Odev.id, skip, limit, cursor)
 
 def get_ogrenci_odevleri(db: Session, ogrenci_id: int):
     return db.query(models.Odev).filter(models.Odev.ogrenci_id == ogrenci_id).all()
 
 def get_koc_odevleri(db: Session, koc_id: int):
     return db.query(models.Odev).filter(models.Odev.koc_id == koc_id).all()
-
-def update_odev(db: Session, odev_id: int, odev: schemas.OdevUpdate):
-    db_odev = get_odev(db, odev_id)
-    if db_odev:
-        for key, value in odev.dict(exclude_unset=True).items():
-            setattr(db_odev, key, value)
-        db.commit()
-        db.refresh(db_odev)
-    return db_odev
-
-def delete_odev(db: Session, odev_id: int):
-    db_odev = get_odev(db, odev_id)
-    if db_odev:
-        db.delete(db_odev)
-        db.commit()
-    return db_odev 
\ No newline at end of file
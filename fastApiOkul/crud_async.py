@@ -0,0 +1,559 @@
+from fastapi import HTTPException, status
+from datetime import datetime
+from sqlalchemy import delete, func, insert, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from collections import Counter
+from typing import Optional
+import models
+import schemas
+import pagination
+import database
+import odev_sayaclari
+from security import get_password_hash_async
+from entity_cache import entity_cache
+
+# crud.py fonksiyonlarının AsyncSession ile çalışan karşılıkları.
+# Async session'da lazy load yapılamadığı için response'a giren ilişkiler
+# sorgu sırasında yüklenir.
+
+# Koc.ogrenciler için route bazında seçilebilen yükleme stratejileri.
+# selectin: sayfadaki tüm koçların öğrencileri tek bir IN sorgusuyla gelir (listeler için)
+# joined: koç ve öğrencileri tek sorguda JOIN ile gelir (tekil kayıt için)
+KOC_YUKLEME = {"selectin": selectinload, "joined": joinedload}
+
+def _koc_query(yukleme: str = "selectin"):
+    return select(models.Koc).options(KOC_YUKLEME[yukleme](models.Koc.ogrenciler))
+
+async def _ogrenci_koclari(db: AsyncSession, ogrenci_id: int):
+    result = await db.execute(
+        select(models.koc_ogrenci.c.koc_id).filter(models.koc_ogrenci.c.ogrenci_id == ogrenci_id)
+    )
+    return result.scalars().all()
+
+async def _sayfa(db: AsyncSession, query, sort_col, id_col, skip: int, limit: int, cursor: Optional[str]):
+    """cursor verilirse keyset, verilmezse offset sayfalama uygular"""
+    if cursor is None:
+        query = pagination.order_keyset(query, sort_col, id_col).offset(skip).limit(limit)
+        return (await db.execute(query)).unique().scalars().all()
+    rows = []
+    for q in pagination.keyset_queries(query, sort_col, id_col, cursor):
+        rows += (await db.execute(q.limit(limit - len(rows)))).unique().scalars().all()
+        if len(rows) >= limit:
+            break
+    return rows
+
+# 🟢 Koç CRUD Fonksiyonları
+async def get_koc_by_id(db: AsyncSession, koc_id: int, yukleme: str = "selectin"):
+    result = await db.execute(_koc_query(yukleme).filter(models.Koc.id == koc_id))
+    return result.unique().scalars().first()
+
+async def get_koc(db: AsyncSession, koc_id: int, yukleme: str = "selectin"):
+    return await get_koc_by_id(db, koc_id, yukleme)
+
+async def get_koc_json(db: AsyncSession, koc_id: int):
+    """Koç detayının JSON byte'larını önbellekten ya da veritabanından getirir"""
+    async def yukle():
+        db_koc = await get_koc_by_id(db, koc_id, yukleme="joined")
+        return None if db_koc is None else schemas.Koc.model_validate(db_koc)
+    return await entity_cache.get_or_load("koc", koc_id, yukle)
+
+async def get_koc_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(models.Koc).filter(models.Koc.email == email))
+    return result.scalars().first()
+
+async def get_koclar(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    yukleme: str = "selectin"
+):
+    return await _sayfa(db, _koc_query(yukleme), models.Koc.email, models.Koc.id, skip, limit, cursor)
+
+async def create_koc(db: AsyncSession, koc: schemas.KocCreate):
+    hashed_password = await get_password_hash_async(koc.sifre)
+    db_koc = models.Koc(
+        email=koc.email,
+        ad=koc.ad,
+        soyad=koc.soyad,
+        uzmanlik=koc.uzmanlik,
+        sifre_hash=hashed_password
+    )
+    db.add(db_koc)
+    await db.commit()
+    await db.refresh(db_koc, ["ogrenciler"])
+    return db_koc
+
+async def update_koc(db: AsyncSession, koc_id: int, koc: schemas.KocCreate):
+    db_koc = await get_koc_by_id(db, koc_id)
+    if db_koc:
+        for key, value in koc.dict(exclude_unset=True).items():
+            if key == "sifre":
+                key, value = "sifre_hash", await get_password_hash_async(value)
+            setattr(db_koc, key, value)
+        await db.commit()
+        await entity_cache.invalidate("koc", koc_id)
+    return db_koc
+
+async def delete_koc(db: AsyncSession, koc_id: int):
+    db_koc = await get_koc_by_id(db, koc_id)
+    if db_koc:
+        odev_idler = await _sahip_silindi(db, "koc_id", koc_id)
+        await db.delete(db_koc)
+        await db.commit()
+        await entity_cache.invalidate("koc", koc_id)
+        await entity_cache.invalidate("odev", *odev_idler)
+    return db_koc
+
+# 🟢 Öğrenci CRUD Fonksiyonları
+async def get_ogrenci_by_id(db: AsyncSession, ogrenci_id: int):
+    result = await db.execute(select(models.Ogrenci).filter(models.Ogrenci.id == ogrenci_id))
+    return result.scalars().first()
+
+async def get_ogrenci(db: AsyncSession, ogrenci_id: int):
+    return await get_ogrenci_by_id(db, ogrenci_id)
+
+async def get_ogrenci_json(db: AsyncSession, ogrenci_id: int):
+    """Öğrenci detayının JSON byte'larını önbellekten ya da veritabanından getirir"""
+    async def yukle():
+        db_ogrenci = await get_ogrenci(db, ogrenci_id)
+        return None if db_ogrenci is None else schemas.Ogrenci.model_validate(db_ogrenci)
+    return await entity_cache.get_or_load("ogrenci", ogrenci_id, yukle)
+
+async def get_ogrenci_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(models.Ogrenci).filter(models.Ogrenci.email == email))
+    return result.scalars().first()
+
+async def get_ogrenci_by_no(db: AsyncSession, ogrenci_no: str):
+    result = await db.execute(select(models.Ogrenci).filter(models.Ogrenci.ogrenciNo == ogrenci_no))
+    return result.scalars().first()
+
+async def get_ogrenciler(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = select(models.Ogrenci)
+    return await _sayfa(db, query, models.Ogrenci.ogrenciNo, models.Ogrenci.id, skip, limit, cursor)
+
+async def create_ogrenci(db: AsyncSession, ogrenci: schemas.OgrenciCreate):
+    hashed_password = await get_password_hash_async(ogrenci.sifre)
+    db_ogrenci = models.Ogrenci(
+        ogrenciNo=ogrenci.ogrenci_no,
+        ad=ogrenci.ad,
+        soyad=ogrenci.soyad,
+        email=ogrenci.email,
+        sinif=ogrenci.sinif,
+        sifre_hash=hashed_password
+    )
+    db.add(db_ogrenci)
+    await db.commit()
+    await db.refresh(db_ogrenci)
+    return db_ogrenci
+
+async def update_ogrenci(db: AsyncSession, ogrenci_id: int, ogrenci: schemas.OgrenciCreate):
+    db_ogrenci = await get_ogrenci(db, ogrenci_id)
+    if db_ogrenci:
+        for key, value in ogrenci.dict(exclude_unset=True).items():
+            if key == "sifre":
+                key, value = "sifre_hash", await get_password_hash_async(value)
+            setattr(db_ogrenci, key, value)
+        await db.commit()
+        await db.refresh(db_ogrenci)
+        # Koç detayları öğrenci listesini içerdiği için onlar da düşer
+        await entity_cache.invalidate("ogrenci", ogrenci_id)
+        await entity_cache.invalidate("koc", *await _ogrenci_koclari(db, ogrenci_id))
+    return db_ogrenci
+
+async def delete_ogrenci(db: AsyncSession, ogrenci_id: int):
+    db_ogrenci = await get_ogrenci(db, ogrenci_id)
+    if db_ogrenci:
+        koc_idler = await _ogrenci_koclari(db, ogrenci_id)
+        odev_idler = await _sahip_silindi(db, "ogrenci_id", ogrenci_id)
+        await db.delete(db_ogrenci)
+        await db.commit()
+        await entity_cache.invalidate("ogrenci", ogrenci_id)
+        await entity_cache.invalidate("koc", *koc_idler)
+        await entity_cache.invalidate("odev", *odev_idler)
+    return db_ogrenci
+
+# Koç-Öğrenci ilişkisi için fonksiyonlar
+async def get_koc_ogrencileri(db: AsyncSession, koc_id: int):
+    """Bir koçun öğrencilerini getirir"""
+    koc = await get_koc_by_id(db, koc_id)
+    if not koc:
+        return []
+    return koc.ogrenciler
+
+async def koc_ogrenci_ekle(db: AsyncSession, koc_id: int, ogrenci_id: int):
+    """Bir koça öğrenci ekler"""
+    koc = await get_koc_by_id(db, koc_id)
+    ogrenci = await get_ogrenci_by_id(db, ogrenci_id)
+
+    if not koc or not ogrenci:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Koç veya öğrenci bulunamadı"
+        )
+
+    # Öğrenci zaten koçun öğrencisi mi kontrol et
+    if ogrenci in koc.ogrenciler:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bu öğrenci zaten koçun öğrencisi"
+        )
+
+    koc.ogrenciler.append(ogrenci)
+    await db.commit()
+    await entity_cache.invalidate("koc", koc_id)
+    return koc
+
+async def koc_ogrenci_cikar(db: AsyncSession, koc_id: int, ogrenci_id: int):
+    """Bir koçtan öğrenci çıkarır"""
+    koc = await get_koc_by_id(db, koc_id)
+    ogrenci = await get_ogrenci_by_id(db, ogrenci_id)
+
+    if not koc or not ogrenci:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Koç veya öğrenci bulunamadı"
+        )
+
+    # Öğrenci koçun öğrencisi mi kontrol et
+    if ogrenci not in koc.ogrenciler:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bu öğrenci koçun öğrencisi değil"
+        )
+
+    koc.ogrenciler.remove(ogrenci)
+    await db.commit()
+    await entity_cache.invalidate("koc", koc_id)
+    return koc
+
+# 🟢 Ödev CRUD İşlemleri
+def _sahipler(odevler):
+    """Ödevlerin etkilediği liste sahipleri; kilit sırası sabit olsun diye sıralı"""
+    sahipler = set()
+    for odev in odevler:
+        if odev.ogrenci_id is not None:
+            sahipler.add(f"ogrenci:{odev.ogrenci_id}")
+        if odev.koc_id is not None:
+            sahipler.add(f"koc:{odev.koc_id}")
+    return sorted(sahipler)
+
+async def _sahip_silindi(db: AsyncSession, kolon: str, sahip_id: int):
+    """Silinecek koç/öğrencinin ödevleri ORM tarafından sahipsiz bırakılır (FK NULL olur).
+
+    Bu ödevlerin sayaçları aynı transaction'da silinir ve diğer tarafın liste
+    sürümleri artırılır; önbellekten düşürülecek ödev id'leri döner.
+    """
+    odevler = (await db.execute(
+        select(models.Odev.id, models.Odev.koc_id, models.Odev.ogrenci_id)
+        .filter(getattr(models.Odev, kolon) == sahip_id)
+    )).all()
+    await db.execute(delete(models.OdevSayac).filter(getattr(models.OdevSayac, kolon) == sahip_id))
+    await _versiyon_artir(db, _sahipler(odevler))
+    return [o.id for o in odevler]
+
+async def _versiyon_artir(db: AsyncSession, sahipler):
+    """Liste sürümlerini çağıranın transaction'ı içinde tek bir upsert ile artırır"""
+    if not sahipler:
+        return
+    stmt = database.upsert(db, models.OdevVersiyon).values([{"sahip": s, "versiyon": 1} for s in sahipler])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["sahip"],
+        set_={"versiyon": models.OdevVersiyon.versiyon + 1}
+    )
+    await db.execute(stmt)
+
+async def get_odev_versiyonu(db: AsyncSession, sahip: str):
+    result = await db.execute(
+        select(models.OdevVersiyon.versiyon).filter(models.OdevVersiyon.sahip == sahip)
+    )
+    return result.scalar() or 0
+
+async def create_odev(db: AsyncSession, odev: schemas.OdevCreate):
+    db_odev = models.Odev(**odev.dict())
+    db.add(db_odev)
+    await _versiyon_artir(db, _sahipler([odev]))
+    await odev_sayaclari.guncelle(db, Counter([
+        (odev.koc_id, odev.ogrenci_id, schemas.OdevDurum.BEKLEMEDE.value)
+    ]))
+    await db.commit()
+    await db.refresh(db_odev)
+    return db_odev
+
+async def create_odev_toplu(db: AsyncSession, odev: schemas.OdevTopluCreate, koc_id: int):
+    """Aynı ödevi koçun öğrencilerine tek bir INSERT ... SELECT ... RETURNING ile atar.
+
+    Atanamayan id'lerden var olanlar yetkisiz (koçun öğrencisi değil), olmayanlar bulunamadı sayılır.
+    """
+    kaynak = select(
+        literal(odev.baslik),
+        literal(odev.aciklama),
+        literal(odev.teslim_tarihi),
+        literal(datetime.utcnow()),
+        literal(schemas.OdevDurum.BEKLEMEDE.value),
+        literal(koc_id),
+        models.Ogrenci.id,
+    )
+    # Yalnızca koçun kendi öğrencilerine atanır; id listesi verilse de koc_ogrenci ile süzülür
+    kaynak = kaynak.join(models.koc_ogrenci, models.koc_ogrenci.c.ogrenci_id == models.Ogrenci.id)
+    kaynak = kaynak.filter(models.koc_ogrenci.c.koc_id == koc_id)
+    if not odev.tum_ogrenciler:
+        kaynak = kaynak.filter(models.Ogrenci.id.in_(odev.ogrenci_idler))
+    stmt = insert(models.Odev).from_select(
+        ["baslik", "aciklama", "teslim_tarihi", "olusturma_tarihi", "durum", "koc_id", "ogrenci_id"],
+        kaynak
+    ).returning(*models.Odev.__table__.c)
+    # Kolonlar açıkça döndürülür: satırlar ORM nesnesi değil, response_model'e giden Row'lardır
+    odevler = (await db.execute(stmt)).all()
+    await _versiyon_artir(db, _sahipler(odevler))
+    await odev_sayaclari.guncelle(db, Counter(odev_sayaclari.anahtar(o) for o in odevler))
+    await db.commit()
+    atanan = {o.ogrenci_id for o in odevler}
+    kalan = sorted(set(odev.ogrenci_idler) - atanan)
+    yetkisiz = set()
+    if kalan:
+        yetkisiz = set((await db.execute(
+            select(models.Ogrenci.id).filter(models.Ogrenci.id.in_(kalan))
+        )).scalars().all())
+    return {
+        "odevler": odevler,
+        "yetkisiz": sorted(yetkisiz),
+        "bulunamayan": [i for i in kalan if i not in yetkisiz],
+    }
+
+async def get_odev(db: AsyncSession, odev_id: int):
+    result = await db.execute(select(models.Odev).filter(models.Odev.id == odev_id))
+    return result.scalars().first()
+
+async def get_odev_json(db: AsyncSession, odev_id: int):
+    """Ödev detayının JSON byte'larını önbellekten ya da veritabanından getirir"""
+    async def yukle():
+        db_odev = await get_odev(db, odev_id)
+        return None if db_odev is None else schemas.Odev.model_validate(db_odev)
+    return await entity_cache.get_or_load("odev", odev_id, yukle)
+
+async def get_odev_by_id(db: AsyncSession, odev_id: int):
+    return await get_odev(db, odev_id)
+
+def _odev_select(ozet: bool = False):
+    """ozet=True ise yalnızca models.ODEV_OZET_KOLONLARI yüklenir"""
+    query = select(models.Odev)
+    if ozet:
+        query = query.options(load_only(*models.ODEV_OZET_KOLONLARI))
+    return query
+
+async def get_ogrenci_odevler(db: AsyncSession, ogrenci_id: int, ozet: bool = False):
+    result = await db.execute(_odev_select(ozet).filter(models.Odev.ogrenci_id == ogrenci_id))
+    return result.scalars().all()
+
+async def get_koc_odevler(db: AsyncSession, koc_id: int, ozet: bool = False):
+    result = await db.execute(_odev_select(ozet).filter(models.Odev.koc_id == koc_id))
+    return result.scalars().all()
+
+async def stream_koc_odevler(koc_id: int, yield_per: int = 1000):
+    """Koçun ödevlerini server-side cursor ile parça parça üretir.
+
+    StreamingResponse gövdesi dependency'ler kapandıktan sonra okunduğu için
+    kendi oturumunu açar; oturum generator bitince ya da kapatılınca kapanır.
+    """
+    query = (
+        select(models.Odev)
+        .filter(models.Odev.koc_id == koc_id)
+        .order_by(models.Odev.id)
+        .execution_options(yield_per=yield_per)
+    )
+    db = database.AsyncSessionLocal()
+    try:
+        result = await db.stream(query)
+        async for parca in result.scalars().partitions():
+            yield parca
+            # Gönderilen satırlar identity map'te birikmesin; expunge_all yield_per
+            # yüklemesinin tuttuğu identity map'i geçersiz kıldığı için tek tek çıkarılır
+            for odev in parca:
+                db.expunge(odev)
+    finally:
+        await db.close()
+
+async def get_odevler(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    koc_id: Optional[int] = None,
+    ogrenci_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    ozet: bool = False
+):
+    query = _odev_select(ozet)
+    if koc_id:
+        query = query.filter(models.Odev.koc_id == koc_id)
+    if ogrenci_id:
+        query = query.filter(models.Odev.ogrenci_id == ogrenci_id)
+    return await _sayfa(db, query, models.Odev.teslim_tarihi, models.Odev.id, skip, limit, cursor)
+
+async def update_odev(db: AsyncSession, odev_id: int, odev: schemas.OdevUpdate):
+    db_odev = await get_odev(db, odev_id)
+    if db_odev:
+        eski = odev_sayaclari.anahtar(db_odev)
+        for key, value in odev.dict(exclude_unset=True).items():
+            setattr(db_odev, key, value)
+        yeni = odev_sayaclari.anahtar(db_odev)
+        degisim = Counter()
+        if eski != yeni:
+            degisim[eski] -= 1
+            degisim[yeni] += 1
+        await _versiyon_artir(db, _sahipler([db_odev]))
+        await odev_sayaclari.guncelle(db, degisim)
+        await db.commit()
+        await db.refresh(db_odev)
+        await entity_cache.invalidate("odev", odev_id)
+    return db_odev
+
+GECIKENLERI_ISARETLE_SQL = {
+    "postgresql": text("""
+WITH secilen AS (
+    SELECT id FROM odevler
+    WHERE durum = :acik AND teslim_tarihi < :simdi
+    ORDER BY teslim_tarihi, id
+    LIMIT :batch
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE odevler o SET durum = :gecikti
+FROM secilen
+WHERE o.id = secilen.id
+RETURNING o.id, o.koc_id, o.ogrenci_id
+"""),
+    # SQLite'ta yazma işlemleri zaten sıralı çalışır; SKIP LOCKED gerekmez
+    "sqlite": text("""
+UPDATE odevler SET durum = :gecikti
+WHERE id IN (
+    SELECT id FROM odevler
+    WHERE durum = :acik AND teslim_tarihi < :simdi
+    ORDER BY teslim_tarihi, id
+    LIMIT :batch
+)
+RETURNING id, koc_id, ogrenci_id
+"""),
+}
+
+async def gecikenleri_isaretle(db: AsyncSession, batch: int, simdi: datetime):
+    """Teslim tarihi geçmiş en fazla batch kadar açık ödevi 'gecikti' yapar ve commit eder.
+
+    Postgres'te satırlar FOR UPDATE SKIP LOCKED ile seçildiği için birden çok
+    worker aynı anda çalışabilir; her biri farklı satırları alır.
+    """
+    result = await db.execute(GECIKENLERI_ISARETLE_SQL[db.get_bind().dialect.name], {
+        "acik": schemas.OdevDurum.BEKLEMEDE.value,
+        "gecikti": schemas.OdevDurum.GECIKTI.value,
+        "simdi": simdi,
+        "batch": batch,
+    })
+    satirlar = result.all()
+    if satirlar:
+        degisim = Counter()
+        for _, koc_id, ogrenci_id in satirlar:
+            degisim[(koc_id, ogrenci_id, schemas.OdevDurum.BEKLEMEDE.value)] -= 1
+            degisim[(koc_id, ogrenci_id, schemas.OdevDurum.GECIKTI.value)] += 1
+        await _versiyon_artir(db, _sahipler(satirlar))
+        await odev_sayaclari.guncelle(db, degisim)
+    await db.commit()
+    await entity_cache.invalidate("odev", *(s.id for s in satirlar))
+    return len(satirlar)
+
+async def en_eski_geciken(db: AsyncSession, simdi: datetime):
+    """Henüz işaretlenmemiş en eski gecikmiş ödevin teslim tarihi"""
+    result = await db.execute(
+        select(func.min(models.Odev.teslim_tarihi)).filter(
+            models.Odev.durum == schemas.OdevDurum.BEKLEMEDE.value,
+            models.Odev.teslim_tarihi < simdi
+        )
+    )
+    return result.scalar()
+
+async def update_odev_durumu(db: AsyncSession, odev_id: int, odev: schemas.OdevUpdate):
+    return await update_odev(db, odev_id, odev)
+
+# Tek istekte durumu değiştirilebilecek en fazla ödev
+TOPLU_DURUM_LIMIT = 500
+
+# Postgres: eski durumlar satır kilitleriyle aynı ifadede okunur.
+# Sahip kolonu sabit bir listeden seçilir; kullanıcı girdisi SQL'e girmez
+_TOPLU_DURUM_SQL = {
+    sahip: text(f"""
+UPDATE odevler o SET durum = :durum
+FROM (
+    SELECT id, durum FROM odevler
+    WHERE id = ANY(:idler) AND {sahip} = :sahip_id
+    ORDER BY id
+    FOR UPDATE
+) eski
+WHERE o.id = eski.id
+RETURNING o.id, o.koc_id, o.ogrenci_id, eski.durum AS eski_durum
+""")
+    for sahip in ("koc_id", "ogrenci_id")
+}
+
+async def _toplu_durum_sirali(db: AsyncSession, idler, durum: str, sahip: str, sahip_id: int):
+    """Postgres dışındaki veritabanları için: eski durumları okuyup aynı transaction'da günceller.
+
+    SQLite aynı anda tek yazıcıya izin verdiği için satır kilidi gerekmez.
+    """
+    satirlar = (await db.execute(
+        select(models.Odev.id, models.Odev.koc_id, models.Odev.ogrenci_id, models.Odev.durum.label("eski_durum"))
+        .filter(models.Odev.id.in_(idler), getattr(models.Odev, sahip) == sahip_id)
+        .order_by(models.Odev.id)
+    )).all()
+    if satirlar:
+        tablo = models.Odev.__table__
+        await db.execute(tablo.update().where(tablo.c.id.in_([s.id for s in satirlar])).values(durum=durum))
+    return satirlar
+
+async def toplu_durum_guncelle(db: AsyncSession, idler, durum: schemas.OdevDurum, sahip: str, sahip_id: int):
+    """Sahibin ödevlerinden idler içindekilerin durumunu tek UPDATE ile değiştirir ve commit eder.
+
+    sahip "koc_id" ya da "ogrenci_id"dir. Güncellenemeyen id'ler için yalnızca
+    varlık kontrolü yapılır: var olanlar yetkisiz, olmayanlar bulunamadı sayılır.
+    """
+    idler = sorted(set(idler))
+    if not idler:
+        raise HTTPException(status_code=400, detail="Ödev listesi boş")
+    if len(idler) > TOPLU_DURUM_LIMIT:
+        raise HTTPException(status_code=400, detail=f"En fazla {TOPLU_DURUM_LIMIT} ödev güncellenebilir")
+    yeni = durum.value
+    if db.get_bind().dialect.name == "postgresql":
+        satirlar = (await db.execute(
+            _TOPLU_DURUM_SQL[sahip], {"durum": yeni, "idler": idler, "sahip_id": sahip_id}
+        )).all()
+    else:
+        satirlar = await _toplu_durum_sirali(db, idler, yeni, sahip, sahip_id)
+    guncellenen = {s.id for s in satirlar}
+    kalan = [i for i in idler if i not in guncellenen]
+    yetkisiz = []
+    if kalan:
+        yetkisiz = (await db.execute(select(models.Odev.id).filter(models.Odev.id.in_(kalan)))).scalars().all()
+    degisenler = [s for s in satirlar if s.eski_durum != yeni]
+    if degisenler:
+        degisim = Counter()
+        for s in degisenler:
+            degisim[(s.koc_id, s.ogrenci_id, s.eski_durum)] -= 1
+            degisim[(s.koc_id, s.ogrenci_id, yeni)] += 1
+        await _versiyon_artir(db, _sahipler(degisenler))
+        await odev_sayaclari.guncelle(db, degisim)
+    await db.commit()
+    await entity_cache.invalidate("odev", *(s.id for s in degisenler))
+    yetkisiz = set(yetkisiz)
+    return {
+        "guncellenen": sorted(guncellenen),
+        "yetkisiz": sorted(yetkisiz),
+        "bulunamayan": [i for i in kalan if i not in yetkisiz],
+    }
+
+async def delete_odev(db: AsyncSession, odev_id: int):
+    db_odev = await get_odev(db, odev_id)
+    if db_odev:
+        await db.delete(db_odev)
+        await _versiyon_artir(db, _sahipler([db_odev]))
+        await odev_sayaclari.guncelle(db, Counter({odev_sayaclari.anahtar(db_odev): -1}))
+        await db.commit()
+        await entity_cache.invalidate("odev", odev_id)
+    return db_odev
@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Tekil GET'ler (/odev/{id}, /ogrenci/{id}, /koc/{id}) için okuma önbelleği.
+# Değerler response'un zaten serileştirilmiş JSON byte'larıdır; isabette ne
+# veritabanına ne de Pydantic'e gidilir.
+#
+# İki katman vardır: süreç içi LRU (kısa TTL) ve isteğe bağlı paylaşılan
+# backend (ENTITY_CACHE_URL=redis://...). crud_async'teki güncelleme/silme
+# fonksiyonları commit sonrası ilgili anahtarı iki katmandan da siler; diğer
+# worker'ların yerel kopyası en geç ENTITY_CACHE_LOCAL_TTL sonra düşer.
+#
+# Silme anahtarı kaldırmak yerine ENTITY_CACHE_TOMBSTONE_TTL süreli bir mezar
+# taşı yazar; loader sonuçları yalnızca anahtar boşsa (NX) yazılır. Böylece
+# güncellemeden önce başlamış bir okuma, silmeden sonra eski değeri geri
+# yazamaz. Mezar süresince o kayıt için istekler veritabanına gider.
+# Mezardan uzun süren bir yükleme (yavaş sorgu, havuz beklemesi) silmeden önce
+# okumuş olabilir ve mezar o sırada düşmüş olabilir; böyle sonuçlar hiç
+# yazılmaz. Yani pencere yalnızca önbelleğe alınabilecek en uzun yüklemeyi belirler.
+ENTITY_CACHE_LOCAL_TTL = float(os.getenv("ENTITY_CACHE_LOCAL_TTL", 5))
+ENTITY_CACHE_TTL = int(os.getenv("ENTITY_CACHE_TTL", 60))
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", 10000))
+ENTITY_CACHE_TOMBSTONE_TTL = float(os.getenv("ENTITY_CACHE_TOMBSTONE_TTL", 2))
+ENTITY_CACHE_URL = os.getenv("ENTITY_CACHE_URL")
+
+# serialize() hiçbir zaman boş byte döndürmez
+MEZAR = b""
+
+class LocalBackend:
+    """Boyut ve TTL sınırlı, thread-safe LRU. Testlerde paylaşılan backend yerine de kullanılabilir."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str):
+        with self._lock:
+            kayit = self._data.get(key)
+            if kayit is None:
+                return None
+            value, bitis = kayit
+            if time.monotonic() >= bitis:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: float, nx: bool = False):
+        with self._lock:
+            simdi = time.monotonic()
+            if nx:
+                kayit = self._data.get(key)
+                if kayit is not None and simdi < kayit[1]:
+                    return
+            self._data[key] = (value, simdi + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+class RedisBackend:
+    """Worker'lar arası paylaşılan önbellek; redis paketi gerektirir"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str):
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float, nx: bool = False):
+        await self._client.set(key, value, px=int(ttl * 1000), nx=nx)
+
+class EntityCache:
+    def __init__(self, local: LocalBackend, shared=None):
+        self.local = local
+        self.shared = shared
+        self.hit_local = 0
+        self.hit_shared = 0
+        self.miss = 0
+        self.gec_yukleme = 0
+
+    @staticmethod
+    def _key(tip: str, obj_id: int):
+        return f"{tip}:{obj_id}"
+
+    async def get_or_load(self, tip: str, obj_id: int, loader):
+        """Önbellekteki JSON byte'larını döndürür; yoksa loader'dan gelen modeli serileştirip saklar.
+
+        loader kayıt yoksa None döndürmelidir; bulunamayan kayıtlar önbelleğe alınmaz.
+        """
+        key = self._key(tip, obj_id)
+        value = await self.local.get(key)
+        if value is not None and value != MEZAR:
+            self.hit_local += 1
+            return value
+        if value is None and self.shared is not None:
+            value = await self.shared.get(key)
+            if value is not None and value != MEZAR:
+                self.hit_shared += 1
+                await self.local.set(key, value, ENTITY_CACHE_LOCAL_TTL, nx=True)
+                return value
+        self.miss += 1
+        baslangic = time.monotonic()
+        model = await loader()
+        if model is None:
+            return None
+        value = serialize(model)
+        if time.monotonic() - baslangic >= ENTITY_CACHE_TOMBSTONE_TTL:
+            self.gec_yukleme += 1
+            return value
+        # Yükleme sırasında gelen bir silme mezar taşı bırakmışsa eski değer yazılmaz
+        await self.local.set(key, value, ENTITY_CACHE_LOCAL_TTL, nx=True)
+        if self.shared is not None:
+            await self.shared.set(key, value, ENTITY_CACHE_TTL, nx=True)
+        return value
+
+    async def invalidate(self, tip: str, *obj_ids: int):
+        for obj_id in obj_ids:
+            key = self._key(tip, obj_id)
+            await self.local.set(key, MEZAR, ENTITY_CACHE_TOMBSTONE_TTL)
+            if self.shared is not None:
+                await self.shared.set(key, MEZAR, ENTITY_CACHE_TOMBSTONE_TTL)
+
+    def metrics(self):
+        return {
+            "size": len(self.local),
+            "hit_local": self.hit_local,
+            "hit_shared": self.hit_shared,
+            "miss": self.miss,
+            "slow_load": self.gec_yukleme,
+        }
+
+def serialize(model) -> bytes:
+    """FastAPI'nin response_model çıktısıyla aynı JSON byte'larını üretir"""
+    return JSONResponse(jsonable_encoder(model)).body
+
+entity_cache = EntityCache(
+    LocalBackend(ENTITY_CACHE_SIZE),
+    RedisBackend(ENTITY_CACHE_URL) if ENTITY_CACHE_URL else None
+)
@@ -0,0 +1,27 @@
+import hashlib
+from fastapi import Request, Response
+import crud_async
+
+# Koşullu GET yardımcıları: güçlü ETag üretimi ve If-None-Match kontrolü.
+
+def etag_uret(*parcalar) -> str:
+    ozet = hashlib.sha1("|".join(str(p) for p in parcalar).encode()).hexdigest()
+    return f'"{ozet}"'
+
+def govde_etag(govde: bytes) -> str:
+    return f'"{hashlib.sha1(govde).hexdigest()}"'
+
+def eslesiyor(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    adaylar = [e.strip() for e in if_none_match.split(",")]
+    return "*" in adaylar or etag in adaylar
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+async def odev_liste_etag(db, sahip: str, request: Request) -> str:
+    """Sahibin ödev listesi sürümünden ve sorgu parametrelerinden ETag üretir"""
+    versiyon = await crud_async.get_odev_versiyonu(db, sahip)
+    return etag_uret(sahip, versiyon, request.url.query)
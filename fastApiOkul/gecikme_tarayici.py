@@ -0,0 +1,95 @@
+"""Teslim tarihi geçmiş açık ödevleri 'gecikti' durumuna taşıyan tarayıcı.
+
+Ödevler teslim tarihi sırasıyla, sınırlı boyutlu batch'ler halinde ve her
+batch ayrı bir transaction'da güncellenir; böylece kilitler kısa sürer.
+Postgres'te satırlar FOR UPDATE SKIP LOCKED ile seçildiği için birden çok
+worker ya da CLI süreci aynı anda güvenle çalışabilir; SQLite'ta yazmalar
+zaten sırayla yapılır.
+
+Uygulama içinde SWEEPER_INTERVAL (saniye) > 0 verilirse arka planda çalışır.
+Komut satırından:
+
+    python gecikme_tarayici.py [--batch 1000] [--surekli --aralik 60]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+import crud_async
+import database
+
+SWEEPER_INTERVAL = float(os.getenv("SWEEPER_INTERVAL", 0))
+SWEEPER_BATCH = int(os.getenv("SWEEPER_BATCH", 1000))
+
+class GecikmeTarayici:
+    def __init__(self, batch: int):
+        self.batch = batch
+        self.toplam = 0
+        self.son_hiz = 0.0
+        self.gecikme = 0.0
+        self._task = None
+
+    async def tara(self):
+        """Bekleyen tüm gecikmiş ödevleri işler; işlenen satır sayısını döndürür"""
+        simdi = datetime.utcnow()
+        islenen = 0
+        baslangic = time.perf_counter()
+        while True:
+            async with database.AsyncSessionLocal() as db:
+                n = await crud_async.gecikenleri_isaretle(db, self.batch, simdi)
+            islenen += n
+            if n < self.batch:
+                break
+        sure = time.perf_counter() - baslangic
+        self.toplam += islenen
+        self.son_hiz = islenen / sure if sure > 0 else 0.0
+        # Başka bir worker'ın kilitli tuttuğu ya da bu arada gecikmiş satırlar kalmış olabilir
+        async with database.AsyncSessionLocal() as db:
+            en_eski = await crud_async.en_eski_geciken(db, datetime.utcnow())
+        self.gecikme = (datetime.utcnow() - en_eski).total_seconds() if en_eski else 0.0
+        return islenen
+
+    async def _dongu(self, aralik: float):
+        while True:
+            try:
+                n = await self.tara()
+                if n:
+                    logging.info(f"Gecikme taraması: {n} ödev, {self.son_hiz:.0f} satır/sn")
+            except Exception as e:
+                logging.error(f"🔥 Gecikme taraması hatası: {str(e)}")
+            await asyncio.sleep(aralik)
+
+    def baslat(self, aralik: float):
+        self._task = asyncio.get_running_loop().create_task(self._dongu(aralik))
+
+    def durdur(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def metrics(self):
+        return {"toplam": self.toplam, "son_hiz": self.son_hiz, "gecikme_sn": self.gecikme}
+
+tarayici = GecikmeTarayici(SWEEPER_BATCH)
+
+async def _main(args):
+    tarayici.batch = args.batch
+    try:
+        while True:
+            n = await tarayici.tara()
+            m = tarayici.metrics()
+            print(f"{n} ödev işaretlendi, {m['son_hiz']:.0f} satır/sn, gecikme {m['gecikme_sn']:.0f} sn")
+            if not args.surekli:
+                break
+            await asyncio.sleep(args.aralik)
+    finally:
+        await database.async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gecikmiş ödev tarayıcısı")
+    parser.add_argument("--batch", type=int, default=SWEEPER_BATCH)
+    parser.add_argument("--surekli", action="store_true", help="Aralıklarla çalışmaya devam et")
+    parser.add_argument("--aralik", type=float, default=60)
+    asyncio.run(_main(parser.parse_args()))
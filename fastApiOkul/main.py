@@ -1,11 +1,78 @@
+import time
+_IMPORT_BASLANGIC = time.perf_counter()
+
+import asyncio
 import logging
+import os
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from database import engine, Base
+from fastapi.responses import JSONResponse, PlainTextResponse
+from jose import jwt
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from database import DB_POOL_SIZE, engine, async_engine, read_router
 from routers import koc, ogrenci, odev
+from security import ALGORITHM, HASH_WORKERS, SECRET_KEY, create_access_token, get_password_hash_async, hash_executor, token_cache
+from entity_cache import entity_cache
+from gecikme_tarayici import SWEEPER_INTERVAL, tarayici
+from ogrenci_arama import OGRENCI_INDEKS_INTERVAL, ogrenci_indeksi
+from metrics import RequestTimer, instrument_pool, registry
+import migrasyonlar
+import query_stats
+
+# Şema migrasyonları açılışta değil deploy adımında çalışır:
+#   python migrasyonlar.py upgrade
+# Açılışta yalnızca havuz ve bcrypt/JWT yolları ısıtılır; bunlar başarısız
+# olsa da worker ayağa kalkar, ilk istekler soğuk yoldan gider.
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "1") == "1"
+
+baslangic_sureleri = {}
+
+async def _havuzu_isit():
+    async def baglan():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    # Bağlantılar aynı anda tutulduğu için havuzda DB_POOL_SIZE açık bağlantı kalır
+    await asyncio.gather(*(baglan() for _ in range(DB_POOL_SIZE)))
+    bekleyen = await migrasyonlar.bekleyen_sayisi(async_engine)
+    if bekleyen:
+        logging.warning(f"Uygulanmamış {bekleyen} şema migrasyonu var: python migrasyonlar.py upgrade")
+
+async def _guvenligi_isit():
+    # Process havuzundaki her worker bcrypt'i bir kez yükler
+    await asyncio.gather(*(get_password_hash_async("isinma") for _ in range(HASH_WORKERS)))
+    jwt.decode(create_access_token({"sub": "0"}), SECRET_KEY, algorithms=[ALGORITHM])
 
-# Veritabanı tablolarını oluştur
-Base.metadata.create_all(bind=engine)
+async def _isit():
+    for ad, fn in (("pool", _havuzu_isit), ("security", _guvenligi_isit)):
+        baslangic = time.perf_counter()
+        try:
+            await fn()
+        except Exception as e:
+            logging.warning(f"Açılış ısıtması başarısız ({ad}): {str(e)}")
+        baslangic_sureleri[f"warmup_{ad}"] = time.perf_counter() - baslangic
+
+@asynccontextmanager
+async def lifespan(app):
+    baslangic = time.perf_counter()
+    if STARTUP_WARMUP:
+        await _isit()
+    read_router.baslat()
+    if SWEEPER_INTERVAL > 0:
+        tarayici.baslat(SWEEPER_INTERVAL)
+    if OGRENCI_INDEKS_INTERVAL > 0:
+        ogrenci_indeksi.baslat(OGRENCI_INDEKS_INTERVAL)
+    baslangic_sureleri["lifespan"] = time.perf_counter() - baslangic
+    baslangic_sureleri["total"] = time.perf_counter() - _IMPORT_BASLANGIC
+    logging.info(f"Worker {baslangic_sureleri['total'] * 1000:.0f} ms'de hazır: {baslangic_sureleri}")
+    try:
+        yield
+    finally:
+        tarayici.durdur()
+        ogrenci_indeksi.durdur()
+        await read_router.durdur()
+        hash_executor.shutdown()
 
 app = FastAPI(
     title="Okul API",
@@ -13,11 +80,19 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# 🔥 Hata Loglama Middleware'i
+# 🔥 Hata Loglama ve Metrik Middleware'i
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
+    timer = RequestTimer()
+    stats = query_stats.baslat()
+    status_code = 500
     try:
         response = await call_next(request)
+        status_code = response.status_code
+        if request.method not in ("GET", "HEAD", "OPTIONS") and status_code < 400:
+            read_router.yazdi(response)
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.2f}"
         return response
     except Exception as e:
         logging.error(f"🔥 HATA: {str(e)}")
@@ -25,8 +100,108 @@ async def log_requests(request: Request, call_next):
             status_code=500,
             content={"message": f"Internal Server Error: {str(e)}"},
         )
+    finally:
+        timer.bitir(request, status_code)
+
+# FastAPI sürümünden bağımsız olarak on_event yerine tek bir lifespan kullanılır
+app.router.lifespan_context = lifespan
+
+# Havuzdan bağlantı alınamadı: istek kuyrukta asılı kalmak yerine hemen reddedilir
+@app.exception_handler(PoolTimeoutError)
+async def havuz_dolu(request: Request, exc: PoolTimeoutError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Veritabanı şu anda meşgul, lütfen tekrar deneyin"},
+        headers={"Retry-After": "1"},
+    )
+
+# statement_timeout aşıldı (SQLSTATE 57014)
+@app.exception_handler(DBAPIError)
+async def veritabani_hatasi(request: Request, exc: DBAPIError):
+    kod = getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)
+    if kod == "57014":
+        return JSONResponse(status_code=503, content={"detail": "Sorgu zaman aşımına uğradı"})
+    raise exc
 
 # Routerları ekle
 app.include_router(koc.router, prefix="/api", tags=["Koç"])
 app.include_router(ogrenci.router, prefix="/api", tags=["Öğrenci"])
 app.include_router(odev.router, prefix="/api", tags=["Ödev"])
+
+# 📊 Metrikler
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
+query_stats.instrument(engine)
+query_stats.instrument(async_engine.sync_engine)
+for replika in read_router.replikalar:
+    instrument_pool(replika.engine.sync_engine, replika.ad)
+    query_stats.instrument(replika.engine.sync_engine)
+
+@registry.collector
+def _baslangic():
+    return [
+        ("app_startup_seconds", "gauge", "Worker açılış süresi (import dahil)", [
+            ({"phase": faz}, sure) for faz, sure in baslangic_sureleri.items()
+        ]),
+    ]
+
+@registry.collector
+def _threadpool():
+    limiter = to_thread.current_default_thread_limiter()
+    return [
+        ("threadpool_size", "gauge", "Starlette threadpool boyutu", [({}, limiter.total_tokens)]),
+        ("threadpool_in_use", "gauge", "Kullanımdaki threadpool slotları", [({}, limiter.borrowed_tokens)]),
+    ]
+
+@registry.collector
+def _uygulama():
+    hash_ = hash_executor.metrics()
+    jwt_ = token_cache.metrics()
+    varlik = entity_cache.metrics()
+    return [
+        ("hash_queue_depth", "gauge", "bcrypt havuzunda bekleyen işler", [({}, hash_["queue_depth"])]),
+        ("hash_completed_total", "counter", "Tamamlanan bcrypt işleri", [({}, hash_["completed"])]),
+        ("hash_rejected_total", "counter", "Kuyruk dolu olduğu için reddedilen bcrypt işleri", [({}, hash_["rejected"])]),
+        ("hash_workers", "gauge", "bcrypt havuzundaki process sayısı", [({}, hash_["workers"])]),
+        ("hash_queue_size", "gauge", "bcrypt kuyruğunun üst sınırı", [({}, hash_["queue_size"])]),
+        ("hash_latency_seconds", "gauge", "Son 1000 bcrypt işinin süre yüzdelikleri", [
+            ({"quantile": q}, hash_[anahtar] / 1000)
+            for q, anahtar in (("0.5", "latency_p50_ms"), ("0.99", "latency_p99_ms"))
+            if hash_[anahtar] is not None
+        ]),
+        ("jwt_cache_size", "gauge", "Doğrulanmış token önbelleğindeki kayıtlar", [({}, jwt_["size"])]),
+        ("cache_hits_total", "counter", "Önbellek isabetleri", [
+            ({"cache": "jwt"}, jwt_["hit"]),
+            ({"cache": "entity_local"}, varlik["hit_local"]),
+            ({"cache": "entity_shared"}, varlik["hit_shared"]),
+        ]),
+        ("cache_misses_total", "counter", "Önbellek ıskalamaları", [
+            ({"cache": "jwt"}, jwt_["miss"]),
+            ({"cache": "entity"}, varlik["miss"]),
+        ]),
+        ("entity_cache_size", "gauge", "Süreç içi varlık önbelleğindeki kayıtlar", [({}, varlik["size"])]),
+        ("entity_cache_slow_loads_total", "counter", "Mezar süresinden uzun sürdüğü için önbelleğe yazılmayan yüklemeler", [({}, varlik["slow_load"])]),
+        ("sweeper_rows_total", "counter", "Gecikti olarak işaretlenen ödevler", [({}, tarayici.toplam)]),
+        ("sweeper_rows_per_second", "gauge", "Son taramanın hızı", [({}, tarayici.son_hiz)]),
+        ("sweeper_lag_seconds", "gauge", "İşaretlenmemiş en eski gecikmiş ödevin yaşı", [({}, tarayici.gecikme)]),
+        ("student_index_size", "gauge", "Otomatik tamamlama indeksindeki öğrenciler", [({}, ogrenci_indeksi.metrics()["ogrenci"])]),
+    ]
+
+@registry.collector
+def _replikalar():
+    okuma = read_router.metrics()
+    replikalar = okuma["replikalar"]
+    return [
+        ("db_reads_total", "counter", "get_read_db ile yönlendirilen okumalar", [({"target": "primary"}, okuma["birincil_okuma"])] + [
+            ({"target": ad}, r["okuma"]) for ad, r in replikalar.items()
+        ]),
+        ("db_replica_healthy", "gauge", "Replika sağlık durumu", [({"replica": ad}, int(r["saglikli"])) for ad, r in replikalar.items()]),
+        ("db_replica_lag_seconds", "gauge", "Replikasyon gecikmesi", [({"replica": ad}, r["gecikme"]) for ad, r in replikalar.items()]),
+    ]
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+baslangic_sureleri["import"] = time.perf_counter() - _IMPORT_BASLANGIC
@@ -0,0 +1,140 @@
+import time
+from bisect import bisect_left
+from sqlalchemy import event
+from starlette.routing import Match
+
+# Prometheus metin formatında /metrics çıktısı üreten hafif kayıt.
+# Sayaçlar yalnızca event loop thread'inden (HTTP middleware) güncellendiği
+# için kilit kullanılmaz; istek başına maliyet birkaç sözlük işlemidir.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def _labels(**labels):
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+class Registry:
+    def __init__(self):
+        self.latency = {}
+        self.requests = {}
+        self.errors = {}
+        self.in_flight = 0
+        self.collectors = []
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float):
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram()
+        histogram.observe(seconds)
+        status_key = (method, route, status_code)
+        self.requests[status_key] = self.requests.get(status_key, 0) + 1
+        if status_code >= 500:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def collector(self, fn):
+        """(ad, tip, yardım, [(etiketler, değer), ...]) listesi döndüren bir fonksiyon ekler"""
+        self.collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_request_duration_seconds İstek süresi",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), h in self.latency.items():
+            labels = _labels(method=method, route=route)
+            toplam = 0
+            for sinir, sayi in zip(LATENCY_BUCKETS, h.counts):
+                toplam += sayi
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{sinir}"}} {toplam}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {h.sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {h.count}")
+
+        lines += ["# HELP http_requests_total Durum koduna göre istek sayısı", "# TYPE http_requests_total counter"]
+        for (method, route, status_code), sayi in self.requests.items():
+            lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status_code)}}} {sayi}")
+
+        lines += ["# HELP http_request_errors_total 5xx ile biten istekler", "# TYPE http_request_errors_total counter"]
+        for (method, route), sayi in self.errors.items():
+            lines.append(f"http_request_errors_total{{{_labels(method=method, route=route)}}} {sayi}")
+
+        lines += ["# HELP http_requests_in_flight İşlenmekte olan istekler", "# TYPE http_requests_in_flight gauge"]
+        lines.append(f"http_requests_in_flight {self.in_flight}")
+
+        for fn in self.collectors:
+            for ad, tip, yardim, ornekler in fn():
+                lines += [f"# HELP {ad} {yardim}", f"# TYPE {ad} {tip}"]
+                for labels, deger in ornekler:
+                    lines.append(f"{ad}{{{_labels(**labels)}}} {deger}" if labels else f"{ad} {deger}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+def instrument_pool(engine, name: str):
+    """Engine'in bağlantı havuzu için checkout sayacı ve doluluk göstergeleri ekler"""
+    checkouts = [0]
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_conn, conn_record, conn_proxy):
+        checkouts[0] += 1
+
+    @registry.collector
+    def _pool():
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"):
+            return []
+        labels = {"engine": name}
+        return [
+            ("db_pool_size", "gauge", "Havuz boyutu", [(labels, pool.size())]),
+            ("db_pool_checked_out", "gauge", "Kullanımdaki bağlantılar", [(labels, pool.checkedout())]),
+            ("db_pool_overflow", "gauge", "pool_size üzerindeki bağlantılar", [(labels, pool.overflow())]),
+            ("db_pool_checked_in", "gauge", "Boştaki bağlantılar", [(labels, pool.checkedin())]),
+            ("db_pool_checkouts_total", "counter", "Havuzdan alınan bağlantılar", [(labels, checkouts[0])]),
+        ]
+
+def route_etiketi(request) -> str:
+    """İsteğin eşleştiği route şablonu; etiket sayısı path parametreleriyle büyümesin diye"""
+    route = request.scope.get("route")
+    if route is None:
+        # Eski FastAPI/Starlette sürümleri scope'a route koymaz; router'daki sırayla eşleştirilir
+        kismi = None
+        for aday in request.app.router.routes:
+            eslesme, _ = aday.matches(request.scope)
+            if eslesme == Match.FULL:
+                route = aday
+                break
+            if eslesme == Match.PARTIAL and kismi is None:
+                kismi = aday
+        route = route or kismi
+    return getattr(route, "path", None) or "unmatched"
+
+class RequestTimer:
+    """log_requests middleware'inde bir isteği ölçer"""
+    __slots__ = ("baslangic",)
+
+    def __init__(self):
+        self.baslangic = time.perf_counter()
+        registry.in_flight += 1
+
+    def bitir(self, request, status_code: int):
+        registry.in_flight -= 1
+        registry.observe(
+            request.method,
+            route_etiketi(request),
+            status_code,
+            time.perf_counter() - self.baslangic
+        )
@@ -0,0 +1,160 @@
+"""Sürümlü şema migrasyonları.
+
+Uygulama açılışta şemaya dokunmaz; migrasyonlar deploy sırasında ayrı bir
+adım olarak çalıştırılır:
+
+    python migrasyonlar.py upgrade [--hedef N]
+    python migrasyonlar.py status
+
+Uygulanan sürümler schema_migrations tablosunda tutulur. Her migrasyon kendi
+transaction'ında çalışır; Postgres'te advisory lock ile aynı anda tek bir
+süreç migrasyon uygular. Yeni bir şema değişikliği için en sona artan
+numarayla bir fonksiyon eklenir ve @migrasyon ile işaretlenir.
+"""
+import argparse
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
+import database
+import models
+import odev_arama
+import odev_sayaclari
+import ogrenci_arama
+
+# Diğer süreçlerin migrasyonla çakışmaması için advisory lock anahtarı
+KILIT_ANAHTARI = 7219001
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _meta,
+    Column("versiyon", Integer, primary_key=True),
+    Column("aciklama", String, nullable=False),
+    Column("uygulama_tarihi", DateTime, nullable=False),
+)
+
+MIGRASYONLAR = {}
+
+def migrasyon(versiyon: int, aciklama: str):
+    def kaydet(fn):
+        if versiyon in MIGRASYONLAR:
+            raise ValueError(f"Migrasyon {versiyon} iki kez tanımlı")
+        MIGRASYONLAR[versiyon] = (aciklama, fn)
+        return fn
+    return kaydet
+
+@migrasyon(1, "Başlangıç şeması")
+def _baslangic(conn):
+    # Daha önce main.py'deki create_all ile kurulmuş veritabanlarında tablolar zaten vardır
+    models.Base.metadata.create_all(conn, checkfirst=True)
+
+@migrasyon(2, "create_all döneminde mevcut tablolara eklenmemiş indeksler")
+def _eksik_indeksler(conn):
+    for tablo in models.Base.metadata.sorted_tables:
+        for indeks in tablo.indexes:
+            indeks.create(conn, checkfirst=True)
+
+@migrasyon(3, "Ödev tam metin araması (Postgres tsvector + GIN, SQLite FTS5)")
+def _odev_arama(conn):
+    # Postgres'te büyük tablolarda kolon eklemek tabloyu yeniden yazar; bakım penceresinde çalıştırın
+    odev_arama.sema_olustur(conn)
+
+@migrasyon(4, "Öğrenci otomatik tamamlama için pg_trgm indeksi")
+def _ogrenci_arama(conn):
+    ogrenci_arama.sema_olustur(conn)
+
+@migrasyon(5, "Eski büyük harfli ödev durumlarını schemas.OdevDurum değerlerine çevir")
+def _odev_durumlari(conn):
+    # Eski varsayılan "Beklemede" idi; kısmi indeksler yalnızca 'beklemede' satırlarını kapsar.
+    # İptal için ayrı bir durum olmadığından en yakın karşılığı olan reddedildi kullanılır.
+    for eski, yeni in (("Beklemede", "beklemede"), ("Tamamlandı", "tamamlandi"), ("İptal", "reddedildi")):
+        conn.execute(
+            models.Odev.__table__.update().where(models.Odev.durum == eski).values(durum=yeni)
+        )
+
+@migrasyon(6, "Mevcut ödevler için koç panosu sayaçları")
+def _odev_sayaclari(conn):
+    # Sayaçlar 5'te düzeltilen durum değerleriyle hesaplanmalı
+    odev_sayaclari.rebuild_baglanti(conn)
+
+@migrasyon(7, "Koça göre keyset sayfalama için (koc_id, teslim_tarihi, id) indeksi")
+def _koc_teslim_indeksi(conn):
+    for indeks in models.Odev.__table__.indexes:
+        if indeks.name == "ix_odevler_koc_teslim":
+            indeks.create(conn, checkfirst=True)
+
+@migrasyon(8, "schemas.Koc / schemas.Ogrenci alanları için eksik kolonlar")
+def _eksik_kolonlar(conn):
+    # Yeni kurulumlarda kolonları 1 numaralı migrasyon zaten oluşturur
+    for tablo, kolonlar in (
+        (models.Koc.__table__, ("uzmanlik", "created_at")),
+        (models.Ogrenci.__table__, ("sinif", "olusturma_tarihi")),
+    ):
+        mevcut = {k["name"] for k in inspect(conn).get_columns(tablo.name)}
+        for ad in kolonlar:
+            if ad not in mevcut:
+                tip = tablo.c[ad].type.compile(dialect=conn.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {tablo.name} ADD COLUMN {ad} {tip}")
+
+def uygulananlar(conn, olustur: bool = True):
+    if olustur:
+        schema_migrations.create(conn, checkfirst=True)
+    elif not inspect(conn).has_table(schema_migrations.name):
+        return set()
+    return set(conn.execute(select(schema_migrations.c.versiyon)).scalars())
+
+def bekleyenler(conn, olustur: bool = True):
+    yapilan = uygulananlar(conn, olustur)
+    return [v for v in sorted(MIGRASYONLAR) if v not in yapilan]
+
+def upgrade(engine=None, hedef: int = None):
+    """Bekleyen migrasyonları sırayla uygular; uygulanan sürümleri döndürür"""
+    engine = engine or database.engine
+    postgres = engine.dialect.name == "postgresql"
+    uygulanan = []
+    with engine.connect() as conn:
+        if postgres:
+            # Oturum seviyesindeki kilit transaction bitince de bağlantıda kalır
+            with conn.begin():
+                conn.exec_driver_sql(f"SELECT pg_advisory_lock({KILIT_ANAHTARI})")
+        try:
+            with conn.begin():
+                bekleyen = bekleyenler(conn)
+            for versiyon in bekleyen:
+                if hedef is not None and versiyon > hedef:
+                    break
+                aciklama, fn = MIGRASYONLAR[versiyon]
+                with conn.begin():
+                    fn(conn)
+                    conn.execute(schema_migrations.insert().values(
+                        versiyon=versiyon, aciklama=aciklama, uygulama_tarihi=datetime.utcnow()
+                    ))
+                print(f"{versiyon:04d} {aciklama}")
+                uygulanan.append(versiyon)
+        finally:
+            if postgres:
+                with conn.begin():
+                    conn.exec_driver_sql(f"SELECT pg_advisory_unlock({KILIT_ANAHTARI})")
+    return uygulanan
+
+async def bekleyen_sayisi(async_engine):
+    """Uygulama açılışında şemanın güncel olup olmadığını kontrol etmek için"""
+    async with async_engine.connect() as conn:
+        return len(await conn.run_sync(bekleyenler, False))
+
+def status(engine=None):
+    engine = engine or database.engine
+    with engine.begin() as conn:
+        yapilan = uygulananlar(conn)
+    for versiyon in sorted(MIGRASYONLAR):
+        isaret = "x" if versiyon in yapilan else " "
+        print(f"[{isaret}] {versiyon:04d} {MIGRASYONLAR[versiyon][0]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Şema migrasyonları")
+    parser.add_argument("komut", choices=["upgrade", "status"])
+    parser.add_argument("--hedef", type=int, help="Bu sürüme kadar uygula")
+    args = parser.parse_args()
+    if args.komut == "upgrade":
+        if not upgrade(hedef=args.hedef):
+            print("Şema güncel")
+    else:
+        status()
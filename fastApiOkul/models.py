@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, Table
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Text, Boolean, Table, Index, text
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -20,6 +20,8 @@ class Koc(Base):
     ad = Column(String)
     soyad = Column(String)
     sifre_hash = Column(String)
+    uzmanlik = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
     odevler = relationship("Odev", back_populates="koc")
     ogrenciler = relationship("Ogrenci", secondary=koc_ogrenci, back_populates="koclar")
 
@@ -33,9 +35,12 @@ class Ogrenci(Base):
     soyad = Column(String)
     email = Column(String, unique=True, index=True)
     sifre_hash = Column(String)
+    sinif = Column(Integer, nullable=True)
+    olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
     koc_id = Column(Integer, ForeignKey("koclar.id"), nullable=True)
     
-    koc = relationship("Koc", back_populates="ogrenciler")
+    koc = relationship("Koc")
+    koclar = relationship("Koc", secondary=koc_ogrenci, back_populates="ogrenciler")
     odevler = relationship("Odev", back_populates="ogrenci")
 
 class Odev(Base):
@@ -46,7 +51,7 @@ class Odev(Base):
     aciklama = Column(Text)
     teslim_tarihi = Column(DateTime)
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
-    durum = Column(String, default="Beklemede")  # Beklemede, Tamamlandı, İptal
+    durum = Column(String, default="beklemede")  # schemas.OdevDurum değerleri
     notlar = Column(Text, nullable=True)
     
     koc_id = Column(Integer, ForeignKey("koclar.id"))
@@ -54,3 +59,51 @@ class Odev(Base):
     
     koc = relationship("Koc", back_populates="odevler")
     ogrenci = relationship("Ogrenci", back_populates="odevler")
+
+    # get_ogrenci_odevler / get_koc_odevler / get_odevler sorguları için.
+    # Sondaki id, keyset sayfalamanın (teslim_tarihi, id) sırasını indeksten okumasını sağlar.
+    __table_args__ = (
+        Index("ix_odevler_ogrenci_teslim", "ogrenci_id", "teslim_tarihi", "id"),
+        Index("ix_odevler_koc_durum_teslim", "koc_id", "durum", "teslim_tarihi", "id"),
+        # get_odevler(koc_id=...) durum süzmeden (teslim_tarihi, id) sırasıyla sayfalar
+        Index("ix_odevler_koc_teslim", "koc_id", "teslim_tarihi", "id"),
+        Index("ix_odevler_teslim", "teslim_tarihi", "id"),
+        # Yalnızca açık (beklemede) ödevler: öğrenci panosu ve gecikme taraması
+        Index(
+            "ix_odevler_acik",
+            "ogrenci_id", "teslim_tarihi",
+            postgresql_where=text("durum = 'beklemede'")
+        ),
+        # Gecikme taraması açık ödevleri teslim tarihi sırasıyla gezer
+        Index(
+            "ix_odevler_acik_teslim",
+            "teslim_tarihi", "id",
+            postgresql_where=text("durum = 'beklemede'")
+        ),
+    )
+
+# Liste endpoint'lerinin ozet=true görünümünde yüklenen kolonlar (schemas.OdevOzet).
+# aciklama ve notlar sınırsız Text olduğu için yalnızca detay GET'inde okunur.
+ODEV_OZET_KOLONLARI = (
+    Odev.id, Odev.baslik, Odev.teslim_tarihi, Odev.durum, Odev.ogrenci_id, Odev.koc_id
+)
+
+# Öğrenci / koç başına ödev listesi sürümü. Ödev yazan her işlem aynı
+# transaction içinde ilgili sahiplerin sürümünü artırır; liste endpoint'leri
+# ETag'i bu tek satırdan üretir.
+class OdevVersiyon(Base):
+    __tablename__ = "odev_versiyonlari"
+
+    sahip = Column(String, primary_key=True)  # "ogrenci:<id>" veya "koc:<id>"
+    versiyon = Column(BigInteger, nullable=False, default=0)
+
+# Koç panosu için (koç, öğrenci, durum) başına ödev sayısı. Ödev yazan
+# işlemler aynı transaction içinde günceller; odev_sayaclari.py rebuild ile
+# odevler tablosundan yeniden hesaplanabilir.
+class OdevSayac(Base):
+    __tablename__ = "odev_sayaclari"
+
+    koc_id = Column(Integer, primary_key=True)
+    ogrenci_id = Column(Integer, primary_key=True)
+    durum = Column(String, primary_key=True)
+    sayi = Column(Integer, nullable=False, default=0)
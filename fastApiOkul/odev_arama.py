@@ -0,0 +1,103 @@
+"""Koçun ödevlerinde başlık ve açıklamaya göre tam metin araması.
+
+Postgres'te odevler.arama, baslik (ağırlık A) ve aciklama (ağırlık B) için
+'turkish' yapılandırmasıyla üretilen bir tsvector kolonudur; (koc_id, arama)
+üzerindeki GIN indeksi (btree_gin) aramayı koçun ödevleriyle sınırlar.
+SQLite'ta aynı sorgu odevler tablosunu trigger'larla izleyen bir FTS5
+tablosu üzerinden çalışır; testler Postgres olmadan koşabilir.
+
+Kolon ve indeksler migrasyonlar.py'deki migrasyonla kurulur; kolon modelde
+tanımlı değildir, ORM sorguları onu hiç yüklemez.
+"""
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Float, column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+import pagination
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    """
+    ALTER TABLE odevler ADD COLUMN IF NOT EXISTS arama tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('turkish', coalesce(baslik, '')), 'A') ||
+        setweight(to_tsvector('turkish', coalesce(aciklama, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_odevler_koc_arama ON odevler USING gin (koc_id, arama)",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS odevler_fts USING fts5(
+        baslik, aciklama, content='odevler', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS odevler_fts_ai AFTER INSERT ON odevler BEGIN
+        INSERT INTO odevler_fts(rowid, baslik, aciklama) VALUES (new.id, new.baslik, new.aciklama);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS odevler_fts_ad AFTER DELETE ON odevler BEGIN
+        INSERT INTO odevler_fts(odevler_fts, rowid, baslik, aciklama)
+        VALUES ('delete', old.id, old.baslik, old.aciklama);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS odevler_fts_au AFTER UPDATE OF baslik, aciklama ON odevler BEGIN
+        INSERT INTO odevler_fts(odevler_fts, rowid, baslik, aciklama)
+        VALUES ('delete', old.id, old.baslik, old.aciklama);
+        INSERT INTO odevler_fts(rowid, baslik, aciklama) VALUES (new.id, new.baslik, new.aciklama);
+    END
+    """,
+    "INSERT INTO odevler_fts(odevler_fts) VALUES ('rebuild')",
+]
+
+def sema_olustur(conn):
+    """Arama kolonunu / FTS tablosunu kurar (migrasyon içinden çağrılır)"""
+    ddl = {"postgresql": POSTGRES_DDL, "sqlite": SQLITE_DDL}.get(conn.dialect.name, [])
+    for ifade in ddl:
+        conn.exec_driver_sql(ifade)
+
+_ESLESENLER = {
+    "postgresql": """
+        SELECT o.id, o.baslik, o.teslim_tarihi, o.durum, o.ogrenci_id, o.koc_id,
+               ts_rank_cd(o.arama, sorgu) AS skor
+        FROM odevler o, websearch_to_tsquery('turkish', :q) AS sorgu
+        WHERE o.koc_id = :koc_id AND o.arama @@ sorgu
+    """,
+    # bm25 küçük değerde daha iyi eşleşme verir; sıralama ortak olsun diye eksisi alınır
+    "sqlite": """
+        SELECT o.id, o.baslik, o.teslim_tarihi, o.durum, o.ogrenci_id, o.koc_id,
+               -bm25(odevler_fts, 2.0, 1.0) AS skor
+        FROM odevler_fts JOIN odevler o ON o.id = odevler_fts.rowid
+        WHERE odevler_fts MATCH :q AND o.koc_id = :koc_id
+    """,
+}
+
+_skor = column("skor", Float)
+
+def _fts5_sorgusu(q: str) -> str:
+    # Her kelime tırnak içinde aranır; kullanıcı girdisi FTS5 sözdizimi olarak yorumlanmaz
+    return " ".join('"' + kelime.replace('"', '""') + '"' for kelime in q.split())
+
+async def ara(db: AsyncSession, koc_id: int, q: str, limit: int = 20, cursor: str = None):
+    """Eşleşen ödevleri skora göre azalan sırayla döndürür; cursor (skor, id) keyset'idir"""
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Arama metni boş")
+    dialect = db.get_bind().dialect.name
+    if dialect not in _ESLESENLER:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Arama bu veritabanında desteklenmiyor")
+    params = {"q": _fts5_sorgusu(q) if dialect == "sqlite" else q, "koc_id": koc_id, "limit": limit}
+    kosul = ""
+    if cursor is not None:
+        params["skor"], params["id"] = pagination.decode_cursor(cursor, _skor)
+        kosul = "WHERE (skor, id) < (CAST(:skor AS REAL), :id)"
+    sorgu = text(f"""
+        SELECT * FROM ({_ESLESENLER[dialect]}) AS eslesen
+        {kosul}
+        ORDER BY skor DESC, id DESC
+        LIMIT :limit
+    """).columns(teslim_tarihi=DateTime, skor=Float)
+    return (await db.execute(sorgu, params)).all()
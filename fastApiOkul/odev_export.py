@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+import zlib
+from fastapi.encoders import jsonable_encoder
+import schemas
+
+# Ödev dışa aktarımı: satır parçalarını NDJSON ya da CSV'ye çevirip isteğe
+# bağlı olarak anında gzip'ler. Bellekte en fazla bir parça tutulur.
+
+FORMATLAR = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+CSV_ALANLARI = list(schemas.Odev.model_fields)
+
+def _ndjson(parca):
+    return "".join(
+        json.dumps(jsonable_encoder(schemas.Odev.model_validate(o)), ensure_ascii=False) + "\n"
+        for o in parca
+    )
+
+def _csv(parca):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for o in parca:
+        veri = jsonable_encoder(schemas.Odev.model_validate(o))
+        writer.writerow([veri[alan] for alan in CSV_ALANLARI])
+    return buf.getvalue()
+
+async def export_et(parcalar, format: str, sikistir: bool):
+    """İlk parçayı response başlamadan çevirir; gövde byte'larını üreten async generator döndürür.
+
+    Şemaya uymayan bir satır böylece yalnızca başlığı gönderilmiş bir 200
+    yerine 500 olarak döner. parcalar her durumda kapatılır.
+    """
+    yaz = _ndjson if format == "ndjson" else _csv
+    try:
+        ilk = yaz(await anext(parcalar, []))
+    except BaseException:
+        await parcalar.aclose()
+        raise
+    return _govde(ilk, parcalar, yaz, format, sikistir)
+
+async def _govde(ilk: str, parcalar, yaz, format: str, sikistir: bool):
+    gzip = zlib.compressobj(wbits=31) if sikistir else None
+
+    def cikti(metin: str):
+        veri = metin.encode("utf-8")
+        return gzip.compress(veri) if gzip else veri
+
+    try:
+        baslik = ",".join(CSV_ALANLARI) + "\n" if format == "csv" else ""
+        veri = cikti(baslik + ilk)
+        if veri:
+            yield veri
+        async for parca in parcalar:
+            veri = cikti(yaz(parca))
+            if veri:
+                yield veri
+        if gzip:
+            yield gzip.flush()
+    finally:
+        await parcalar.aclose()
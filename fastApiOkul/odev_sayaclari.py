@@ -0,0 +1,127 @@
+"""Koç panosu sayaçları.
+
+odev_sayaclari tablosu (koç, öğrenci, durum) başına ödev sayısını tutar;
+crud_async'teki ödev yazma fonksiyonları sayaçları aynı transaction içinde
+günceller. Böylece özet sorgusu koçun ödev sayısıyla değil öğrenci sayısıyla
+orantılıdır.
+
+Mevcut ödevlerin sayaçları 6 numaralı migrasyonla doldurulur. Sayaçlar
+kayarsa odevler tablosundan yeniden hesaplamak için:
+
+    python odev_sayaclari.py rebuild [--koc KOC_ID]
+"""
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+import database
+import models
+import schemas
+
+def durum_degeri(durum) -> str:
+    return getattr(durum, "value", durum)
+
+def anahtar(odev):
+    return (odev.koc_id, odev.ogrenci_id, durum_degeri(odev.durum))
+
+async def guncelle(db: AsyncSession, degisimler: Counter):
+    """{(koc_id, ogrenci_id, durum): fark} değişimlerini tek bir upsert ile uygular"""
+    satirlar = [
+        {"koc_id": k, "ogrenci_id": o, "durum": d, "sayi": fark}
+        for (k, o, d), fark in sorted(degisimler.items())
+        if fark
+    ]
+    if not satirlar:
+        return
+    stmt = database.upsert(db, models.OdevSayac).values(satirlar)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["koc_id", "ogrenci_id", "durum"],
+        set_={"sayi": models.OdevSayac.sayi + stmt.excluded.sayi}
+    )
+    await db.execute(stmt)
+
+async def koc_ozeti(db: AsyncSession, koc_id: int):
+    """Koçun öğrenci bazında ve toplam durum sayıları ile geciken ödevleri"""
+    sayaclar = await db.execute(
+        select(models.OdevSayac.ogrenci_id, models.OdevSayac.durum, models.OdevSayac.sayi)
+        .filter(models.OdevSayac.koc_id == koc_id, models.OdevSayac.sayi > 0)
+    )
+    # Tarayıcının henüz işaretlemediği gecikmiş ödevler; (koc_id, durum, teslim_tarihi)
+    # indeksinde yalnızca geciken açık ödevler taranır.
+    gecikenler = await db.execute(
+        select(models.Odev.ogrenci_id, func.count())
+        .filter(
+            models.Odev.koc_id == koc_id,
+            models.Odev.durum == schemas.OdevDurum.BEKLEMEDE.value,
+            models.Odev.teslim_tarihi < datetime.utcnow()
+        )
+        .group_by(models.Odev.ogrenci_id)
+    )
+
+    ogrenciler = defaultdict(lambda: {"durumlar": {}, "geciken": 0})
+    toplam = Counter()
+    geciken_toplam = 0
+    for ogrenci_id, durum, sayi in sayaclar:
+        ogrenciler[ogrenci_id]["durumlar"][durum] = sayi
+        toplam[durum] += sayi
+        # Tarayıcının 'gecikti' yaptığı ödevler sayaçta durur
+        if durum == schemas.OdevDurum.GECIKTI.value:
+            ogrenciler[ogrenci_id]["geciken"] += sayi
+            geciken_toplam += sayi
+    for ogrenci_id, sayi in gecikenler:
+        ogrenciler[ogrenci_id]["geciken"] += sayi
+        geciken_toplam += sayi
+    return {
+        "koc_id": koc_id,
+        "toplam": dict(toplam),
+        "geciken": geciken_toplam,
+        "ogrenciler": [{"ogrenci_id": o, **v} for o, v in sorted(ogrenciler.items())],
+    }
+
+def _yeniden_hesapla(koc_id: int | None = None):
+    """Sayaçları silip odevler tablosundan yeniden dolduran ifadeler"""
+    silme = delete(models.OdevSayac)
+    # Koçu ya da öğrencisi silinmiş ödevler (FK NULL) sayılmaz
+    kaynak = (
+        select(models.Odev.koc_id, models.Odev.ogrenci_id, models.Odev.durum, func.count())
+        .filter(models.Odev.koc_id.is_not(None), models.Odev.ogrenci_id.is_not(None))
+        .group_by(models.Odev.koc_id, models.Odev.ogrenci_id, models.Odev.durum)
+    )
+    if koc_id is not None:
+        silme = silme.filter(models.OdevSayac.koc_id == koc_id)
+        kaynak = kaynak.filter(models.Odev.koc_id == koc_id)
+    return [silme, insert(models.OdevSayac).from_select(["koc_id", "ogrenci_id", "durum", "sayi"], kaynak)]
+
+# Hesaplama sırasında ödev yazımları bekler; SQLite'ta yazma zaten tüm veritabanını kilitler
+KILIT_SQL = {"postgresql": "LOCK TABLE odevler IN SHARE MODE"}
+
+async def rebuild(db: AsyncSession, koc_id: int | None = None):
+    """Sayaçları odevler tablosundan yeniden hesaplar ve commit eder"""
+    kilit = KILIT_SQL.get(db.get_bind().dialect.name)
+    if kilit:
+        await db.execute(text(kilit))
+    for ifade in _yeniden_hesapla(koc_id):
+        await db.execute(ifade)
+    await db.commit()
+
+def rebuild_baglanti(conn):
+    """Migrasyon içinden: sayaçları çağıranın transaction'ında yeniden hesaplar"""
+    kilit = KILIT_SQL.get(conn.dialect.name)
+    if kilit:
+        conn.exec_driver_sql(kilit)
+    for ifade in _yeniden_hesapla():
+        conn.execute(ifade)
+
+async def _main(args):
+    async with database.AsyncSessionLocal() as db:
+        await rebuild(db, args.koc)
+    await database.async_engine.dispose()
+    print("Ödev sayaçları yeniden hesaplandı")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Koç panosu sayaçları")
+    parser.add_argument("komut", choices=["rebuild"])
+    parser.add_argument("--koc", type=int, help="Yalnızca bu koçun sayaçlarını yeniden hesapla")
+    asyncio.run(_main(parser.parse_args()))
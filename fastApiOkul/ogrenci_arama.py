@@ -0,0 +1,255 @@
+"""Öğrenci otomatik tamamlama: ad, soyad ya da öğrenci numarasıyla arama.
+
+Eşleştirme Türkçe büyük/küçük harf katlamasıyla yapılır (I → ı, İ → i) ve
+iki yolda da aynıdır: sorgu, katlanmış "ad soyad no" metnindeki herhangi bir
+kelimenin başından itibaren eşleşmelidir ("yıl" → "Ali Yılmaz", "ali yıl" de).
+
+Veritabanı yolu: Postgres'te katlanmış "ad soyad no" ifadesi üzerindeki
+pg_trgm GIN indeksi LIKE 'q%' / LIKE '% q%' koşullarını indeksten yanıtlar;
+sonuçlar numara öneki, sonra trigram benzerliğine göre sıralanır. SQLite'ta
+katlama Python'daki katla() ile kaydedilen bir SQL fonksiyonuyla yapılır.
+
+Bellek yolu (OGRENCI_INDEKS_INTERVAL > 0): her worker metnin kelime başından
+başlayan soneklerini sıralı bir listede tutar; aramalar veritabanına gitmeden
+bisect ile yanıtlanır. İndeks her aralıkta yalnızca yeni öğrencileri
+(id > son_id) ekler, OGRENCI_INDEKS_REBUILD saniyede bir ayrı bir thread'de
+baştan kurulup tek seferde değiştirilir. Bu worker'daki güncelleme ve
+silmeler indekse hemen yansır.
+"""
+import asyncio
+import logging
+import os
+from bisect import bisect_left, insort
+from collections import namedtuple
+from fastapi import HTTPException, status
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+import database
+import models
+
+OGRENCI_INDEKS_INTERVAL = float(os.getenv("OGRENCI_INDEKS_INTERVAL", 0))
+OGRENCI_INDEKS_REBUILD = float(os.getenv("OGRENCI_INDEKS_REBUILD", 600))
+# Daha kısa metinlerden trigram çıkmaz, sorgu tüm indeksi tarar
+OGRENCI_ARAMA_EN_AZ = int(os.getenv("OGRENCI_ARAMA_EN_AZ", 3))
+YUKLEME_PARCASI = 10000
+
+Oneri = namedtuple("Oneri", ["id", "ogrenci_no", "ad", "soyad"])
+
+_TR = str.maketrans({"I": "ı", "İ": "i"})
+
+def katla(metin: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevirir"""
+    return metin.translate(_TR).lower()
+
+def _sqlite_katla(metin):
+    return None if metin is None else katla(metin)
+
+# SQLite'ın lower() fonksiyonu yalnızca ASCII harfleri çevirir
+for _engine in (database.engine, database.async_engine.sync_engine):
+    if _engine.dialect.name == "sqlite":
+        @event.listens_for(_engine, "connect")
+        def _katla_kaydet(dbapi_conn, conn_record):
+            dbapi_conn.create_function("katla", 1, _sqlite_katla, deterministic=True)
+
+_METIN = "coalesce(ad, '') || ' ' || coalesce(soyad, '') || ' ' || coalesce(\"ogrenciNo\", '')"
+
+# İndeksteki ifadeyle birebir aynı olmalı; aksi halde planlayıcı indeksi kullanmaz
+ARAMA_IFADESI = f"lower(translate({_METIN}, 'Iİ', 'ıi'))"
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_ogrenciler_arama_trgm ON ogrenciler USING gin (({ARAMA_IFADESI}) gin_trgm_ops)",
+]
+
+def sema_olustur(conn):
+    """Trigram indeksini kurar (migrasyon içinden çağrılır); SQLite'ta indekssiz tarama yapılır"""
+    if conn.dialect.name == "postgresql":
+        for ifade in POSTGRES_DDL:
+            conn.exec_driver_sql(ifade)
+
+_SORGULAR = {
+    "postgresql": text(f"""
+        SELECT id, "ogrenciNo" AS ogrenci_no, ad, soyad FROM ogrenciler
+        WHERE {ARAMA_IFADESI} LIKE :onek ESCAPE '\\' OR {ARAMA_IFADESI} LIKE :kelime ESCAPE '\\'
+        ORDER BY "ogrenciNo" LIKE :onek ESCAPE '\\' DESC, similarity({ARAMA_IFADESI}, :q) DESC, id
+        LIMIT :limit
+    """),
+    "sqlite": text(f"""
+        SELECT id, "ogrenciNo" AS ogrenci_no, ad, soyad FROM (
+            SELECT id, "ogrenciNo", ad, soyad, katla({_METIN}) AS metin FROM ogrenciler
+        )
+        WHERE metin LIKE :onek ESCAPE '\\' OR metin LIKE :kelime ESCAPE '\\'
+        ORDER BY katla(coalesce("ogrenciNo", '')) LIKE :onek ESCAPE '\\' DESC, ad, soyad, id
+        LIMIT :limit
+    """),
+}
+
+def _like_kacir(metin: str) -> str:
+    return metin.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+async def veritabaninda_ara(db: AsyncSession, q: str, limit: int):
+    dialect = db.get_bind().dialect.name
+    if dialect not in _SORGULAR:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Arama bu veritabanında desteklenmiyor")
+    kacik = _like_kacir(q)
+    params = {"q": q, "onek": f"{kacik}%", "kelime": f"% {kacik}%", "limit": limit}
+    return (await db.execute(_SORGULAR[dialect], params)).all()
+
+class OgrenciIndeksi:
+    """(anahtar, id) ikililerinden oluşan sıralı liste üzerinde önek araması"""
+
+    def __init__(self):
+        self.hazir = False
+        self.son_id = 0
+        self._anahtarlar = []
+        self._ogrenciler = {}
+        # Yeniden kurulum sürerken bu worker'da yapılan değişiklikler; yeni indekse tekrar uygulanır
+        self._degisiklikler = None
+        self._task = None
+
+    @staticmethod
+    def _tokenlar(oneri: Oneri):
+        """Katlanmış "ad soyad no" metninin her kelimeden başlayan sonekleri"""
+        kelimeler = katla(f"{oneri.ad or ''} {oneri.soyad or ''} {oneri.ogrenci_no or ''}").split()
+        return {" ".join(kelimeler[i:]) for i in range(len(kelimeler))}
+
+    @classmethod
+    def _kur(cls, oneriler):
+        """Anahtar listesini bir kez sıralayarak kurar; event loop dışında çalışır"""
+        anahtarlar = [(token, oneri.id) for oneri in oneriler for token in cls._tokenlar(oneri)]
+        anahtarlar.sort()
+        return anahtarlar, {oneri.id: oneri for oneri in oneriler}
+
+    def _ekle(self, oneri: Oneri):
+        self._ogrenciler[oneri.id] = oneri
+        for token in self._tokenlar(oneri):
+            insort(self._anahtarlar, (token, oneri.id))
+
+    def _sil(self, ogrenci_id: int):
+        oneri = self._ogrenciler.pop(ogrenci_id, None)
+        if oneri is None:
+            return
+        for token in self._tokenlar(oneri):
+            i = bisect_left(self._anahtarlar, (token, ogrenci_id))
+            if i < len(self._anahtarlar) and self._anahtarlar[i] == (token, ogrenci_id):
+                del self._anahtarlar[i]
+
+    def _uygula(self, oneri_ya_da_id):
+        if isinstance(oneri_ya_da_id, Oneri):
+            self._sil(oneri_ya_da_id.id)
+            self._ekle(oneri_ya_da_id)
+        else:
+            self._sil(oneri_ya_da_id)
+
+    def _degistir(self, oneri_ya_da_id):
+        if self._degisiklikler is not None:
+            self._degisiklikler.append(oneri_ya_da_id)
+        if self.hazir:
+            self._uygula(oneri_ya_da_id)
+
+    def ekle(self, ogrenci):
+        """Bu worker'da eklenen / güncellenen öğrenciyi indekse yansıtır"""
+        self._degistir(Oneri(ogrenci.id, ogrenci.ogrenciNo, ogrenci.ad, ogrenci.soyad))
+
+    def sil(self, ogrenci_id: int):
+        self._degistir(ogrenci_id)
+
+    def ara(self, q: str, limit: int):
+        adaylar = {}
+        i = bisect_left(self._anahtarlar, (q,))
+        # Çok kısa öneklerde tüm eşleşmeler yerine sınırlı sayıda aday sıralanır
+        while i < len(self._anahtarlar) and len(adaylar) < limit * 10:
+            token, ogrenci_id = self._anahtarlar[i]
+            if not token.startswith(q):
+                break
+            adaylar.setdefault(ogrenci_id, token)
+            i += 1
+        sirali = sorted(
+            adaylar.items(),
+            key=lambda aday: (
+                not katla(self._ogrenciler[aday[0]].ogrenci_no or "").startswith(q),
+                aday[1] != q,
+                aday[1],
+                aday[0],
+            )
+        )
+        return [self._ogrenciler[ogrenci_id] for ogrenci_id, _ in sirali[:limit]]
+
+    async def _oku(self, son_id: int):
+        """son_id'den büyük öğrencileri parça parça okur"""
+        oneriler = []
+        while True:
+            async with database.AsyncSessionLocal() as db:
+                satirlar = (await db.execute(
+                    select(models.Ogrenci.id, models.Ogrenci.ogrenciNo, models.Ogrenci.ad, models.Ogrenci.soyad)
+                    .filter(models.Ogrenci.id > son_id)
+                    .order_by(models.Ogrenci.id)
+                    .limit(YUKLEME_PARCASI)
+                )).all()
+            oneriler += [Oneri(*satir) for satir in satirlar]
+            if satirlar:
+                son_id = satirlar[-1].id
+            if len(satirlar) < YUKLEME_PARCASI:
+                return oneriler
+
+    async def yeniden_kur(self):
+        self._degisiklikler = []
+        try:
+            oneriler = await self._oku(0)
+            anahtarlar, ogrenciler = await asyncio.to_thread(self._kur, oneriler)
+            degisiklikler = self._degisiklikler
+        finally:
+            self._degisiklikler = None
+        self._anahtarlar, self._ogrenciler = anahtarlar, ogrenciler
+        self.son_id = oneriler[-1].id if oneriler else 0
+        self.hazir = True
+        for degisiklik in degisiklikler:
+            self._uygula(degisiklik)
+
+    async def yenile(self):
+        oneriler = await self._oku(self.son_id)
+        if not oneriler:
+            return
+        self.son_id = max(self.son_id, oneriler[-1].id)
+        # Bu worker'da güncellenip zaten eklenmiş olabilir
+        yeniler = [oneri for oneri in oneriler if oneri.id not in self._ogrenciler]
+        for oneri in yeniler:
+            self._ogrenciler[oneri.id] = oneri
+        # Yeni anahtarlar sona eklenip bir kez sıralanır; iki sıralı parçayı timsort doğrusal sürede birleştirir
+        self._anahtarlar += [(token, oneri.id) for oneri in yeniler for token in self._tokenlar(oneri)]
+        self._anahtarlar.sort()
+
+    async def _dongu(self, aralik: float):
+        kurulum = 0.0
+        while True:
+            try:
+                if not self.hazir or kurulum >= OGRENCI_INDEKS_REBUILD:
+                    await self.yeniden_kur()
+                    kurulum = 0.0
+                else:
+                    await self.yenile()
+            except Exception as e:
+                logging.error(f"🔥 Öğrenci indeksi yenilenemedi: {str(e)}")
+            await asyncio.sleep(aralik)
+            kurulum += aralik
+
+    def baslat(self, aralik: float):
+        self._task = asyncio.get_running_loop().create_task(self._dongu(aralik))
+
+    def durdur(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def metrics(self):
+        return {"hazir": self.hazir, "ogrenci": len(self._ogrenciler), "anahtar": len(self._anahtarlar)}
+
+ogrenci_indeksi = OgrenciIndeksi()
+
+async def ara(db: AsyncSession, q: str, limit: int):
+    q = katla(q.strip())
+    if len(q) < OGRENCI_ARAMA_EN_AZ:
+        return []
+    if ogrenci_indeksi.hazir:
+        return ogrenci_indeksi.ara(q, limit)
+    return await veritabaninda_ara(db, q, limit)
@@ -0,0 +1,203 @@
+"""CSV'den toplu öğrenci aktarımı.
+
+Dosya parça parça okunur, şifreler security.hash_executor havuzunda küçük
+parçalar halinde hashlenir (havuz doluysa aktarım 503 ile durur) ve
+satırlar PostgreSQL COPY ile geçici bir staging tablosuna yüklenir. Ardından
+tek bir INSERT ... ON CONFLICT DO NOTHING ile ogrenciler tablosuna aktarılır;
+eklenemeyen satırlar satır numarasıyla raporlanır.
+
+Beklenen başlık: ogrenciNo,ad,soyad,email,sifre
+
+bcrypt maliyeti (passlib varsayılanı 12 tur, hash başına ~0.25 sn) aktarım
+süresini belirler: 50k satır ~12.500 çekirdek-saniyedir, yani 8 çekirdekte
+havuzun yarısıyla ~50 dakika sürer. Bu maliyetle aktarım bir dakikanın altına
+inemez; daha büyük dosyalar arka planda ya da bakım penceresinde çalıştırılmalıdır.
+
+Komut satırından:
+
+    python ogrenci_import.py ogrenciler.csv
+"""
+import asyncio
+import codecs
+import csv
+import os
+import sys
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from security import get_password_hash, hash_executor
+
+ALANLAR = ["ogrenciNo", "ad", "soyad", "email", "sifre"]
+BATCH_BOYUTU = 5000
+PARCA_BOYUTU = 64 * 1024
+
+# Havuza tek seferde gönderilen şifre sayısı ve aynı anda havuzda bekleyen en
+# fazla parça. Parçalar küçük tutulur ki login'ler araya girebilsin; aktarım
+# varsayılan olarak havuzun en fazla yarısını kullanır.
+IMPORT_HASH_PARCA = int(os.getenv("IMPORT_HASH_PARCA", 16))
+IMPORT_HASH_ESZAMANLI = int(os.getenv("IMPORT_HASH_ESZAMANLI", max(1, hash_executor.workers // 2)))
+
+STAGING_DDL = """
+CREATE TEMP TABLE ogrenci_import (
+    satir integer PRIMARY KEY,
+    "ogrenciNo" text NOT NULL,
+    ad text,
+    soyad text,
+    email text NOT NULL,
+    sifre_hash text NOT NULL
+) ON COMMIT DROP
+"""
+
+# Dosya içinde tekrar eden ogrenciNo / email: ilk satır kalır, diğerleri hata olur
+TEKRAR_SQL = """
+DELETE FROM ogrenci_import s
+USING ogrenci_import t
+WHERE s.{alan} = t.{alan} AND s.satir > t.satir
+RETURNING s.satir, s."ogrenciNo"
+"""
+
+MERGE_SQL = """
+WITH eklenen AS (
+    INSERT INTO ogrenciler ("ogrenciNo", ad, soyad, email, sifre_hash)
+    SELECT "ogrenciNo", ad, soyad, email, sifre_hash FROM ogrenci_import ORDER BY satir
+    ON CONFLICT DO NOTHING
+    RETURNING "ogrenciNo"
+)
+SELECT s.satir, s."ogrenciNo", e."ogrenciNo" IS NOT NULL AS eklendi
+FROM ogrenci_import s
+LEFT JOIN eklenen e ON e."ogrenciNo" = s."ogrenciNo"
+"""
+
+
+def _hash_batch(sifreler):
+    return [get_password_hash(s) for s in sifreler]
+
+
+async def _csv_parcalari(parcalar):
+    """Byte parçalarından tamamlanmış CSV satırlarını liste halinde üretir.
+
+    Tırnak içinde satır sonu içeren alanlar desteklenmez.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    kalan = ""
+    async for parca in parcalar:
+        kalan += decoder.decode(parca)
+        *satirlar, kalan = kalan.split("\n")
+        if satirlar:
+            yield list(csv.reader(satirlar))
+    kalan += decoder.decode(b"", final=True)
+    if kalan.strip():
+        yield list(csv.reader([kalan]))
+
+
+async def _hashle(sifreler):
+    # Parçalar login'lerle aynı sınırlı kuyruğa girer. Aktarım havuzun tamamını
+    # tutmadığı için login'ler çoğunlukla boş worker bulur; bulamazsa en fazla
+    # bir parçanın süresi kadar (16 hash ~4 sn) bekler
+    sinir = asyncio.Semaphore(IMPORT_HASH_ESZAMANLI)
+
+    async def parca_hashle(parca):
+        async with sinir:
+            return await hash_executor.run(_hash_batch, parca, olc=False)
+
+    parcalar = [sifreler[i:i + IMPORT_HASH_PARCA] for i in range(0, len(sifreler), IMPORT_HASH_PARCA)]
+    sonuclar = await asyncio.gather(*(parca_hashle(p) for p in parcalar))
+    return [h for parca in sonuclar for h in parca]
+
+
+async def _yukle(raw, batch):
+    hashler = await _hashle([kayit[-1] for kayit in batch])
+    kayitlar = [(*kayit[:-1], h) for kayit, h in zip(batch, hashler)]
+    await raw.copy_records_to_table(
+        "ogrenci_import",
+        records=kayitlar,
+        columns=["satir", "ogrenciNo", "ad", "soyad", "email", "sifre_hash"],
+    )
+
+
+def _dogrula(satir_no, kayit, indeksler):
+    """Satırı (satir, ogrenciNo, ad, soyad, email, sifre) demetine çevirir; hata varsa mesaj döner"""
+    degerler = {alan: (kayit[i].strip() if i < len(kayit) else "") for alan, i in indeksler.items()}
+    eksik = [alan for alan in ("ogrenciNo", "email", "sifre") if not degerler[alan]]
+    if eksik:
+        return None, f"Eksik alan: {', '.join(eksik)}"
+    if "@" not in degerler["email"]:
+        return None, "Geçersiz email"
+    return (satir_no, *(degerler[alan] for alan in ALANLAR)), None
+
+
+async def import_ogrenciler(db: AsyncSession, parcalar):
+    """CSV byte parçalarını içe aktarır; eklenen sayısını ve satır bazlı hataları döndürür"""
+    conn = await db.connection()
+    raw = (await conn.get_raw_connection()).driver_connection
+    await db.execute(text(STAGING_DDL))
+
+    hatalar = []
+    indeksler = None
+    satir_no = 0
+    batch = []
+    async for satirlar in _csv_parcalari(parcalar):
+        for kayit in satirlar:
+            satir_no += 1
+            if indeksler is None:
+                basliklar = [b.strip() for b in kayit]
+                eksik = [alan for alan in ALANLAR if alan not in basliklar]
+                if eksik:
+                    await db.rollback()
+                    return {"eklenen": 0, "hatalar": [
+                        {"satir": 1, "ogrenci_no": None, "hata": f"Eksik sütun: {', '.join(eksik)}"}
+                    ]}
+                indeksler = {alan: basliklar.index(alan) for alan in ALANLAR}
+                continue
+            if not any(alan.strip() for alan in kayit):
+                continue
+            deger, hata = _dogrula(satir_no, kayit, indeksler)
+            if hata:
+                i = indeksler["ogrenciNo"]
+                ogrenci_no = kayit[i] if i < len(kayit) else None
+                hatalar.append({"satir": satir_no, "ogrenci_no": ogrenci_no, "hata": hata})
+                continue
+            batch.append(deger)
+            if len(batch) >= BATCH_BOYUTU:
+                await _yukle(raw, batch)
+                batch = []
+    if batch:
+        await _yukle(raw, batch)
+
+    for alan, mesaj in (('"ogrenciNo"', "Dosyada tekrar eden öğrenci numarası"), ("email", "Dosyada tekrar eden email")):
+        for satir, ogrenci_no in (await db.execute(text(TEKRAR_SQL.format(alan=alan)))).all():
+            hatalar.append({"satir": satir, "ogrenci_no": ogrenci_no, "hata": mesaj})
+
+    eklenen = 0
+    for satir, ogrenci_no, eklendi in (await db.execute(text(MERGE_SQL))).all():
+        if eklendi:
+            eklenen += 1
+        else:
+            hatalar.append({"satir": satir, "ogrenci_no": ogrenci_no, "hata": "Öğrenci numarası veya email zaten kayıtlı"})
+    await db.commit()
+
+    hatalar.sort(key=lambda h: h["satir"])
+    return {"eklenen": eklenen, "hatalar": hatalar}
+
+
+async def _dosya_parcalari(yol):
+    with open(yol, "rb") as f:
+        while parca := f.read(PARCA_BOYUTU):
+            yield parca
+
+
+async def _main(yol):
+    from database import AsyncSessionLocal, async_engine
+    async with AsyncSessionLocal() as db:
+        sonuc = await import_ogrenciler(db, _dosya_parcalari(yol))
+    await async_engine.dispose()
+    hash_executor.shutdown()
+    for hata in sonuc["hatalar"]:
+        print(f"satır {hata['satir']} ({hata['ogrenci_no']}): {hata['hata']}", file=sys.stderr)
+    print(f"{sonuc['eklenen']} öğrenci eklendi, {len(sonuc['hatalar'])} hata")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Kullanım: python ogrenci_import.py ogrenciler.csv", file=sys.stderr)
+        sys.exit(2)
+    asyncio.run(_main(sys.argv[1]))
@@ -0,0 +1,62 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, tuple_
+
+# Keyset (cursor) sayfalama yardımcıları.
+# Cursor, sayfanın son satırının (sort_key, id) ikilisini taşıyan opak bir
+# base64 metnidir. Bir sonraki sayfa "WHERE (sort_key, id) > cursor" ile
+# alındığı için derin sayfalar da ilk sayfa kadar ucuzdur.
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_col):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        if sort_value is not None and isinstance(sort_col.type, DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Geçersiz cursor"
+        )
+
+def order_keyset(query, sort_col, id_col):
+    """Sorguyu (sort_key, id) sırasına koyar; NULL değerler en sonda"""
+    return query.order_by(sort_col.asc().nulls_last(), id_col.asc())
+
+def keyset_queries(query, sort_col, id_col, cursor: str | None):
+    """Cursor'dan sonraki satırları sırayla veren sorguları döndürür.
+
+    Satır karşılaştırması (sort_key, id) > cursor indeks üzerinde aralık
+    taramasıyla çalışır. NULL sort_key'li satırlar bu karşılaştırmaya
+    girmediği için ayrı, ikinci bir sorguyla en sonda okunur.
+    """
+    if cursor is None:
+        return [order_keyset(query, sort_col, id_col)]
+    sort_value, row_id = decode_cursor(cursor, sort_col)
+    if sort_value is None:
+        return [order_keyset(query.filter(sort_col.is_(None), id_col > row_id), sort_col, id_col)]
+    return [
+        order_keyset(query.filter(tuple_(sort_col, id_col) > tuple_(sort_value, row_id)), sort_col, id_col),
+        order_keyset(query.filter(sort_col.is_(None)), sort_col, id_col),
+    ]
+
+def next_cursor(rows, sort_attr: str, limit: int) -> str | None:
+    """Sayfa doluysa son satırdan bir sonraki cursor'ı üretir"""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
+
+def cursor_header(rows, sort_attr: str, limit: int) -> dict:
+    """Son sayfada boş sözlük döner; istemci X-Next-Cursor'ın varlığına bakar"""
+    cursor = next_cursor(rows, sort_attr, limit)
+    return {"X-Next-Cursor": cursor} if cursor else {}
@@ -0,0 +1,81 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.orm import Session, raiseload
+
+# İstek başına SQL ölçümü: engine event'leri her ifadeyi o an aktif olan
+# isteğe yazar; middleware sonucu X-DB-Query-Count / X-DB-Time-Ms header'larına
+# koyar.
+#
+# Geliştirme ve testte:
+#   SQL_NPLUSONE_THRESHOLD=N  aynı parametreli ifade bir istekte N'den fazla
+#                             çalışırsa uyarır (SQL_NPLUSONE_MODE=raise ise hata fırlatır)
+#   SQL_RAISE_ON_LAZY_LOAD=1  açıkça yüklenmemiş ilişkiye erişimi hataya çevirir
+NPLUSONE_THRESHOLD = int(os.getenv("SQL_NPLUSONE_THRESHOLD", 0))
+NPLUSONE_MODE = os.getenv("SQL_NPLUSONE_MODE", "warn")
+RAISE_ON_LAZY_LOAD = os.getenv("SQL_RAISE_ON_LAZY_LOAD", "0") == "1"
+
+class NPlusOneError(RuntimeError):
+    pass
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "statements", "uyarilan")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = {}
+        self.uyarilan = set()
+
+_aktif: ContextVar = ContextVar("query_stats", default=None)
+
+def baslat():
+    """Geçerli istek için yeni bir sayaç başlatır"""
+    stats = QueryStats()
+    _aktif.set(stats)
+    return stats
+
+def _n_arti_bir(stats, statement):
+    sayi = stats.statements.get(statement, 0) + 1
+    stats.statements[statement] = sayi
+    if sayi <= NPLUSONE_THRESHOLD or statement in stats.uyarilan:
+        return
+    stats.uyarilan.add(statement)
+    mesaj = f"Olası N+1: aynı ifade bir istekte {sayi} kez çalıştı: {statement[:200]}"
+    if NPLUSONE_MODE == "raise":
+        raise NPlusOneError(mesaj)
+    logging.warning(mesaj)
+
+def _before(conn, cursor, statement, parameters, context, executemany):
+    stats = _aktif.get()
+    if stats is None:
+        return
+    if NPLUSONE_THRESHOLD:
+        _n_arti_bir(stats, statement)
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after(conn, cursor, statement, parameters, context, executemany):
+    stats = _aktif.get()
+    if stats is None:
+        return
+    baslangiclar = conn.info.get("query_start")
+    if baslangiclar:
+        stats.seconds += time.perf_counter() - baslangiclar.pop()
+    stats.count += 1
+
+def instrument(engine):
+    event.listen(engine, "before_cursor_execute", _before)
+    event.listen(engine, "after_cursor_execute", _after)
+
+def _raiseload(orm_execute_state):
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+if RAISE_ON_LAZY_LOAD:
+    event.listen(Session, "do_orm_execute", _raiseload)
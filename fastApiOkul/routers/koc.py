@@ -1,20 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-import crud, schemas, database
-from security import get_current_koc, create_access_token, verify_password
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import crud_async, schemas, database, pagination, odev_sayaclari
+from etag import eslesiyor, govde_etag, not_modified
+from security import get_current_koc, create_access_token, verify_password_async
 
 router = APIRouter()
 
+# Özet sorgusu yoğun koçlarda uzun sürebilir; bağlantıyı en fazla bu kadar ms tutar
+OZET_STATEMENT_TIMEOUT = int(os.getenv("OZET_STATEMENT_TIMEOUT", 2000))
+
 @router.post("/koc/login", response_model=schemas.Token)
-def koc_login(koc_data: schemas.KocLogin, db: Session = Depends(database.get_db)):
-    koc = crud.get_koc_by_email(db, email=koc_data.email)
+async def koc_login(koc_data: schemas.KocLogin, db: AsyncSession = Depends(database.get_async_db)):
+    koc = await crud_async.get_koc_by_email(db, email=koc_data.email)
     if not koc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email veya şifre hatalı"
         )
-    if not verify_password(koc_data.sifre, koc.sifre_hash):
+    if not await verify_password_async(koc_data.sifre, koc.sifre_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email veya şifre hatalı"
@@ -23,47 +28,68 @@ def koc_login(koc_data: schemas.KocLogin, db: Session = Depends(database.get_db)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/koc", response_model=schemas.Koc)
-def create_koc(koc: schemas.KocCreate, db: Session = Depends(database.get_db)):
-    db_koc = crud.get_koc_by_email(db, email=koc.email)
+async def create_koc(koc: schemas.KocCreate, db: AsyncSession = Depends(database.get_async_db)):
+    db_koc = await crud_async.get_koc_by_email(db, email=koc.email)
     if db_koc:
         raise HTTPException(status_code=400, detail="Email zaten kayıtlı")
-    return crud.create_koc(db=db, koc=koc)
+    return await crud_async.create_koc(db=db, koc=koc)
 
 @router.get("/koclar", response_model=List[schemas.Koc])
-def read_koclar(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    koclar = crud.get_koclar(db, skip=skip, limit=limit)
+async def read_koclar(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(database.get_read_db)
+):
+    koclar = await crud_async.get_koclar(db, skip=skip, limit=limit, cursor=cursor, yukleme="selectin")
+    response.headers.update(pagination.cursor_header(koclar, "email", limit))
     return koclar
 
 @router.get("/koc/{koc_id}", response_model=schemas.Koc)
-def read_koc(koc_id: int, db: Session = Depends(database.get_db)):
-    db_koc = crud.get_koc(db, koc_id=koc_id)
-    if db_koc is None:
+async def read_koc(request: Request, koc_id: int, db: AsyncSession = Depends(database.get_async_db)):
+    govde = await crud_async.get_koc_json(db, koc_id=koc_id)
+    if govde is None:
         raise HTTPException(status_code=404, detail="Koç bulunamadı")
-    return db_koc
+    etag = govde_etag(govde)
+    if eslesiyor(request, etag):
+        return not_modified(etag)
+    return Response(content=govde, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/koc/{koc_id}/ozet", response_model=schemas.KocOdevOzet)
+async def read_koc_ozet(
+    koc_id: int,
+    db: AsyncSession = Depends(database.statement_timeout(OZET_STATEMENT_TIMEOUT, okuma=True)),
+    current_koc_id: int = Depends(get_current_koc)
+):
+    """Öğrenci bazında ve toplam ödev durumu sayıları ile geciken ödevler"""
+    if koc_id != current_koc_id:
+        raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
+    return await odev_sayaclari.koc_ozeti(db, koc_id)
 
 @router.put("/koc/{koc_id}", response_model=schemas.Koc)
-def update_koc(
+async def update_koc(
     koc_id: int,
     koc: schemas.KocCreate,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_koc_id: int = Depends(get_current_koc)
 ):
     if koc_id != current_koc_id:
         raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
-    db_koc = crud.update_koc(db=db, koc_id=koc_id, koc=koc)
+    db_koc = await crud_async.update_koc(db=db, koc_id=koc_id, koc=koc)
     if db_koc is None:
         raise HTTPException(status_code=404, detail="Koç bulunamadı")
     return db_koc
 
 @router.delete("/koc/{koc_id}", response_model=schemas.Koc)
-def delete_koc(
+async def delete_koc(
     koc_id: int,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_koc_id: int = Depends(get_current_koc)
 ):
     if koc_id != current_koc_id:
         raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
-    db_koc = crud.delete_koc(db=db, koc_id=koc_id)
+    db_koc = await crud_async.delete_koc(db=db, koc_id=koc_id)
     if db_koc is None:
         raise HTTPException(status_code=404, detail="Koç bulunamadı")
     return db_koc
\ No newline at end of file
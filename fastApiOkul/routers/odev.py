@@ -1,60 +1,161 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-import crud, schemas, database
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import crud_async, schemas, database, pagination, odev_arama, odev_export
+from etag import eslesiyor, govde_etag, not_modified, odev_liste_etag
+from hizli_json import HizliJSONResponse, Serializer
 from security import get_current_koc, get_current_ogrenci
 
 router = APIRouter()
 
+# Tek istekte atanabilecek en fazla öğrenci sayısı
+TOPLU_ODEV_LIMIT = 1000
+
+odev_serializer = Serializer(schemas.Odev)
+odev_ozet_serializer = Serializer(schemas.OdevOzet)
+arama_serializer = Serializer(schemas.OdevAramaSonucu)
+
+# Arama sayfası boyutu üst sınırı
+ARAMA_LIMIT = 100
+
 @router.post("/odev", response_model=schemas.Odev)
-def create_odev(
+async def create_odev(
     odev: schemas.OdevCreate,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_koc_id: int = Depends(get_current_koc)
+):
+    return await crud_async.create_odev(db=db, odev=odev)
+
+@router.post("/odev/toplu", response_model=schemas.OdevTopluSonuc)
+async def create_odev_toplu(
+    odev: schemas.OdevTopluCreate,
+    db: AsyncSession = Depends(database.get_async_db),
     current_koc_id: int = Depends(get_current_koc)
 ):
-    return crud.create_odev(db=db, odev=odev)
+    """Aynı ödevi verilen öğrencilere ya da koçun tüm öğrencilerine tek sorguda atar.
+
+    Koçun öğrencisi olmayan ya da bulunamayan id'ler yetkisiz / bulunamayan listelerinde döner.
+    """
+    if not odev.tum_ogrenciler and not odev.ogrenci_idler:
+        raise HTTPException(status_code=400, detail="Öğrenci listesi boş")
+    if len(odev.ogrenci_idler) > TOPLU_ODEV_LIMIT:
+        raise HTTPException(status_code=400, detail=f"En fazla {TOPLU_ODEV_LIMIT} öğrenciye atanabilir")
+    return await crud_async.create_odev_toplu(db=db, odev=odev, koc_id=current_koc_id)
 
 @router.get("/odevler", response_model=List[schemas.Odev])
-def read_odevler(
+async def read_odevler(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     koc_id: int = None,
     ogrenci_id: int = None,
-    db: Session = Depends(database.get_db)
+    cursor: Optional[str] = None,
+    ozet: bool = False,
+    db: AsyncSession = Depends(database.get_read_db)
 ):
-    odevler = crud.get_odevler(db, skip=skip, limit=limit, koc_id=koc_id, ogrenci_id=ogrenci_id)
-    return odevler
+    """cursor verilirse keyset sayfalama kullanılır; sonraki sayfanın cursor'ı X-Next-Cursor header'ında döner.
+
+    ozet=true ise aciklama ve notlar yüklenmez, schemas.OdevOzet listesi döner.
+    """
+    # Öğrenci ya da koça göre süzülen listeler sahip sürümünden ETag alır
+    etag = None
+    sahip = f"ogrenci:{ogrenci_id}" if ogrenci_id else f"koc:{koc_id}" if koc_id else None
+    if sahip:
+        etag = await odev_liste_etag(db, sahip, request)
+        if eslesiyor(request, etag):
+            return not_modified(etag)
+    odevler = await crud_async.get_odevler(
+        db, skip=skip, limit=limit, koc_id=koc_id, ogrenci_id=ogrenci_id, cursor=cursor, ozet=ozet
+    )
+    headers = pagination.cursor_header(odevler, "teslim_tarihi", limit)
+    if etag:
+        headers["ETag"] = etag
+    serializer = odev_ozet_serializer if ozet else odev_serializer
+    return HizliJSONResponse(serializer.liste(odevler), headers=headers)
+
+@router.patch("/koc-odevler/durum", response_model=schemas.OdevTopluDurumSonuc)
+async def update_koc_odevler_durum(
+    guncelleme: schemas.OdevTopluDurumUpdate,
+    db: AsyncSession = Depends(database.get_async_db),
+    current_koc_id: int = Depends(get_current_koc)
+):
+    """Koçun ödevlerinden verilenlerin durumunu tek sorguda değiştirir; id bazında sonuç döner"""
+    return await crud_async.toplu_durum_guncelle(
+        db, guncelleme.idler, guncelleme.durum, "koc_id", current_koc_id
+    )
+
+@router.get("/koc-odevler/ara", response_model=List[schemas.OdevAramaSonucu])
+async def search_koc_odevler(
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(database.get_read_db),
+    current_koc_id: int = Depends(get_current_koc)
+):
+    """Koçun ödevlerinde başlık ve açıklamada arar; sonuçlar skora göre sıralıdır.
+
+    Sonraki sayfanın cursor'ı X-Next-Cursor header'ında döner.
+    """
+    if not 1 <= limit <= ARAMA_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit 1 ile {ARAMA_LIMIT} arasında olmalı")
+    sonuclar = await odev_arama.ara(db, current_koc_id, q, limit=limit, cursor=cursor)
+    return HizliJSONResponse(
+        arama_serializer.liste(sonuclar),
+        headers=pagination.cursor_header(sonuclar, "skor", limit)
+    )
+
+@router.get("/koc-odevler/export")
+async def export_koc_odevler(
+    format: str = "ndjson",
+    gzip: bool = False,
+    current_koc_id: int = Depends(get_current_koc)
+):
+    """Koçun tüm ödevlerini NDJSON ya da CSV olarak akış halinde indirir"""
+    if format not in odev_export.FORMATLAR:
+        raise HTTPException(status_code=400, detail="format ndjson ya da csv olmalı")
+    # Sıkıştırılmış dosya bir .gz eki olarak iner; Content-Encoding verilirse
+    # istemciler açıp .gz adıyla düz metin kaydeder
+    govde = await odev_export.export_et(crud_async.stream_koc_odevler(current_koc_id), format, gzip)
+    return StreamingResponse(
+        govde,
+        media_type="application/gzip" if gzip else odev_export.FORMATLAR[format],
+        headers={"Content-Disposition": f'attachment; filename="odevler.{format}{".gz" if gzip else ""}"'}
+    )
 
 @router.get("/odev/{odev_id}", response_model=schemas.Odev)
-def read_odev(odev_id: int, db: Session = Depends(database.get_db)):
-    db_odev = crud.get_odev(db, odev_id=odev_id)
-    if db_odev is None:
+async def read_odev(request: Request, odev_id: int, db: AsyncSession = Depends(database.get_async_db)):
+    govde = await crud_async.get_odev_json(db, odev_id=odev_id)
+    if govde is None:
         raise HTTPException(status_code=404, detail="Ödev bulunamadı")
-    return db_odev
+    etag = govde_etag(govde)
+    if eslesiyor(request, etag):
+        return not_modified(etag)
+    return Response(content=govde, media_type="application/json", headers={"ETag": etag})
 
 @router.put("/odev/{odev_id}", response_model=schemas.Odev)
-def update_odev(
+async def update_odev(
     odev_id: int,
     odev: schemas.OdevUpdate,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_koc_id: int = Depends(get_current_koc)
 ):
-    db_odev = crud.get_odev(db, odev_id=odev_id)
+    db_odev = await crud_async.get_odev(db, odev_id=odev_id)
     if db_odev is None:
         raise HTTPException(status_code=404, detail="Ödev bulunamadı")
     if db_odev.koc_id != current_koc_id:
         raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
-    return crud.update_odev(db=db, odev_id=odev_id, odev=odev)
+    return await crud_async.update_odev(db=db, odev_id=odev_id, odev=odev)
 
 @router.delete("/odev/{odev_id}", response_model=schemas.Odev)
-def delete_odev(
+async def delete_odev(
     odev_id: int,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_koc_id: int = Depends(get_current_koc)
 ):
-    db_odev = crud.get_odev(db, odev_id=odev_id)
+    db_odev = await crud_async.get_odev(db, odev_id=odev_id)
     if db_odev is None:
         raise HTTPException(status_code=404, detail="Ödev bulunamadı")
     if db_odev.koc_id != current_koc_id:
         raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
-    return crud.delete_odev(db=db, odev_id=odev_id) 
\ No newline at end of file
+    return await crud_async.delete_odev(db=db, odev_id=odev_id) 
\ No newline at end of file
@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-import schemas, crud, database
-from security import get_current_koc, get_current_ogrenci, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, verify_password
-from typing import List
+import json
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import schemas, crud_async, database, pagination, ogrenci_arama, ogrenci_import
+from etag import eslesiyor, govde_etag, not_modified, odev_liste_etag
+from hizli_json import HizliJSONResponse, Serializer
+from security import get_current_koc, get_current_ogrenci, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, verify_password_async
+from typing import List, Optional
 from datetime import timedelta
 from fastapi.security import OAuth2PasswordRequestForm
 
 router = APIRouter()
 
+odev_serializer = Serializer(schemas.OdevResponse)
+odev_ozet_serializer = Serializer(schemas.OdevOzet)
+oneri_serializer = Serializer(schemas.OgrenciOneri)
+
+# Otomatik tamamlamada dönebilecek en fazla öneri
+ONERI_LIMIT = 20
+
 @router.post("/ogrenci/login", response_model=schemas.Token)
-def ogrenci_login(ogrenci_data: schemas.OgrenciLogin, db: Session = Depends(database.get_db)):
-    ogrenci = crud.get_ogrenci_by_no(db, ogrenci_no=ogrenci_data.ogrenci_no)
+async def ogrenci_login(ogrenci_data: schemas.OgrenciLogin, db: AsyncSession = Depends(database.get_async_db)):
+    ogrenci = await crud_async.get_ogrenci_by_no(db, ogrenci_no=ogrenci_data.ogrenci_no)
     if not ogrenci:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Öğrenci numarası veya şifre hatalı"
         )
-    if not verify_password(ogrenci_data.sifre, ogrenci.sifre_hash):
+    if not await verify_password_async(ogrenci_data.sifre, ogrenci.sifre_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Öğrenci numarası veya şifre hatalı"
@@ -25,110 +35,171 @@ def ogrenci_login(ogrenci_data: schemas.OgrenciLogin, db: Session = Depends(data
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/ogrenci", response_model=schemas.Ogrenci)
-def create_ogrenci(ogrenci: schemas.OgrenciCreate, db: Session = Depends(database.get_db)):
-    db_ogrenci = crud.get_ogrenci_by_no(db, ogrenci_no=ogrenci.ogrenci_no)
+async def create_ogrenci(ogrenci: schemas.OgrenciCreate, db: AsyncSession = Depends(database.get_async_db)):
+    db_ogrenci = await crud_async.get_ogrenci_by_no(db, ogrenci_no=ogrenci.ogrenci_no)
     if db_ogrenci:
         raise HTTPException(status_code=400, detail="Öğrenci numarası zaten kayıtlı")
-    return crud.create_ogrenci(db=db, ogrenci=ogrenci)
+    return await crud_async.create_ogrenci(db=db, ogrenci=ogrenci)
+
+@router.post("/ogrenci/import", response_model=schemas.OgrenciImportSonuc)
+async def import_ogrenciler(
+    dosya: UploadFile = File(...),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_koc_id: int = Depends(get_current_koc)
+):
+    """CSV dosyasından toplu öğrenci ekler (ogrenciNo,ad,soyad,email,sifre)"""
+    async def parcalar():
+        while parca := await dosya.read(ogrenci_import.PARCA_BOYUTU):
+            yield parca
+    return await ogrenci_import.import_ogrenciler(db, parcalar())
 
 @router.get("/ogrenciler", response_model=List[schemas.Ogrenci])
-def read_ogrenciler(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    ogrenciler = crud.get_ogrenciler(db, skip=skip, limit=limit)
+async def read_ogrenciler(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(database.get_read_db)
+):
+    ogrenciler = await crud_async.get_ogrenciler(db, skip=skip, limit=limit, cursor=cursor)
+    response.headers.update(pagination.cursor_header(ogrenciler, "ogrenciNo", limit))
     return ogrenciler
 
-@router.get("/ogrenci/{ogrenci_id}", response_model=schemas.Ogrenci)
-def read_ogrenci(ogrenci_id: int, db: Session = Depends(database.get_db)):
-    db_ogrenci = crud.get_ogrenci(db, ogrenci_id=ogrenci_id)
-    if db_ogrenci is None:
+@router.get("/ogrenci/ara", response_model=List[schemas.OgrenciOneri])
+async def ogrenci_ara(
+    q: str,
+    limit: int = 10,
+    db: AsyncSession = Depends(database.get_read_db),
+    current_koc_id: int = Depends(get_current_koc)
+):
+    """Ad, soyad ya da öğrenci numarasıyla otomatik tamamlama (koç_ogrenci_ekle için)"""
+    if not 1 <= limit <= ONERI_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit 1 ile {ONERI_LIMIT} arasında olmalı")
+    oneriler = await ogrenci_arama.ara(db, q, limit)
+    # Aynı önek için art arda gelen tuş vuruşlarını tarayıcı önbelleği karşılar
+    return HizliJSONResponse(oneri_serializer.liste(oneriler), headers={"Cache-Control": "private, max-age=30"})
+
+@router.get("/ogrenci/{ogrenci_id:int}", response_model=schemas.Ogrenci)
+async def read_ogrenci(request: Request, ogrenci_id: int, db: AsyncSession = Depends(database.get_async_db)):
+    govde = await crud_async.get_ogrenci_json(db, ogrenci_id=ogrenci_id)
+    if govde is None:
         raise HTTPException(status_code=404, detail="Öğrenci bulunamadı")
-    return db_ogrenci
+    etag = govde_etag(govde)
+    if eslesiyor(request, etag):
+        return not_modified(etag)
+    return Response(content=govde, media_type="application/json", headers={"ETag": etag})
 
 @router.put("/ogrenci/{ogrenci_id}", response_model=schemas.Ogrenci)
-def update_ogrenci(
+async def update_ogrenci(
     ogrenci_id: int,
     ogrenci: schemas.OgrenciCreate,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_ogrenci_id: int = Depends(get_current_ogrenci)
 ):
     if ogrenci_id != current_ogrenci_id:
         raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
-    db_ogrenci = crud.update_ogrenci(db=db, ogrenci_id=ogrenci_id, ogrenci=ogrenci)
+    db_ogrenci = await crud_async.update_ogrenci(db=db, ogrenci_id=ogrenci_id, ogrenci=ogrenci)
     if db_ogrenci is None:
         raise HTTPException(status_code=404, detail="Öğrenci bulunamadı")
+    ogrenci_arama.ogrenci_indeksi.ekle(db_ogrenci)
     return db_ogrenci
 
 @router.delete("/ogrenci/{ogrenci_id}", response_model=schemas.Ogrenci)
-def delete_ogrenci(
+async def delete_ogrenci(
     ogrenci_id: int,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_ogrenci_id: int = Depends(get_current_ogrenci)
 ):
     if ogrenci_id != current_ogrenci_id:
         raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
-    db_ogrenci = crud.delete_ogrenci(db=db, ogrenci_id=ogrenci_id)
+    db_ogrenci = await crud_async.delete_ogrenci(db=db, ogrenci_id=ogrenci_id)
+    ogrenci_arama.ogrenci_indeksi.sil(ogrenci_id)
     if db_ogrenci is None:
         raise HTTPException(status_code=404, detail="Öğrenci bulunamadı")
     return db_ogrenci
 
 @router.post("/odev", response_model=schemas.Odev)
-def create_odev(
+async def create_odev(
     odev: schemas.OdevCreate,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_ogrenci_id: int = Depends(get_current_ogrenci)
 ):
-    return crud.create_odev(db=db, odev=odev)
+    return await crud_async.create_odev(db=db, odev=odev)
 
 @router.get("/odev/{odev_id}", response_model=schemas.OdevResponse)
-def get_odev(
+async def get_odev(
+    request: Request,
     odev_id: int,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_koc_id: int = Depends(get_current_koc)
 ):
     """Ödev detaylarını getirir"""
-    odev = crud.get_odev_by_id(db, odev_id)
-    if not odev:
+    govde = await crud_async.get_odev_json(db, odev_id)
+    if govde is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ödev bulunamadı"
         )
-    if odev.koc_id != current_koc_id:
+    if json.loads(govde)["koc_id"] != current_koc_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bu ödevi görüntüleme yetkiniz yok"
         )
-    return odev
+    etag = govde_etag(govde)
+    if eslesiyor(request, etag):
+        return not_modified(etag)
+    return Response(content=govde, media_type="application/json", headers={"ETag": etag})
 
 @router.get("/ogrenci/odevler", response_model=List[schemas.OdevResponse])
-def get_ogrenci_odevler(
-    db: Session = Depends(database.get_db),
-    current_ogrenci: int = Depends(get_current_ogrenci)
+async def get_ogrenci_odevler(
+    request: Request,
+    ozet: bool = False,
+    db: AsyncSession = Depends(database.get_read_db),
+    current_ogrenci_id: int = Depends(get_current_ogrenci)
 ):
-    """Öğrencinin ödevlerini listeler"""
-    ogrenci = crud.get_ogrenci_by_no(db, current_ogrenci)
-    if not ogrenci:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Öğrenci bulunamadı"
-        )
-    return crud.get_ogrenci_odevler(db, ogrenci.id)
+    """Öğrencinin ödevlerini listeler; ozet=true ise aciklama ve notlar olmadan"""
+    etag = await odev_liste_etag(db, f"ogrenci:{current_ogrenci_id}", request)
+    if eslesiyor(request, etag):
+        return not_modified(etag)
+    odevler = await crud_async.get_ogrenci_odevler(db, current_ogrenci_id, ozet=ozet)
+    serializer = odev_ozet_serializer if ozet else odev_serializer
+    return HizliJSONResponse(serializer.liste(odevler), headers={"ETag": etag})
 
 @router.get("/koc-odevler", response_model=List[schemas.OdevResponse])
-def get_koc_odevler(
-    db: Session = Depends(database.get_db),
+async def get_koc_odevler(
+    request: Request,
+    ozet: bool = False,
+    db: AsyncSession = Depends(database.get_read_db),
     current_koc: int = Depends(get_current_koc)
 ):
-    """Koçun verdiği ödevleri listeler"""
-    return crud.get_koc_odevler(db, current_koc)
+    """Koçun verdiği ödevleri listeler; ozet=true ise aciklama ve notlar olmadan"""
+    etag = await odev_liste_etag(db, f"koc:{current_koc}", request)
+    if eslesiyor(request, etag):
+        return not_modified(etag)
+    odevler = await crud_async.get_koc_odevler(db, current_koc, ozet=ozet)
+    serializer = odev_ozet_serializer if ozet else odev_serializer
+    return HizliJSONResponse(serializer.liste(odevler), headers={"ETag": etag})
+
+@router.patch("/ogrenci/odevler/durum", response_model=schemas.OdevTopluDurumSonuc)
+async def update_ogrenci_odevler_durum(
+    guncelleme: schemas.OdevTopluDurumUpdate,
+    db: AsyncSession = Depends(database.get_async_db),
+    current_ogrenci_id: int = Depends(get_current_ogrenci)
+):
+    """Öğrencinin ödevlerinden verilenlerin durumunu tek sorguda değiştirir; id bazında sonuç döner"""
+    return await crud_async.toplu_durum_guncelle(
+        db, guncelleme.idler, guncelleme.durum, "ogrenci_id", current_ogrenci_id
+    )
 
 @router.put("/odev/{odev_id}", response_model=schemas.OdevResponse)
-def update_odev_durumu(
+async def update_odev_durumu(
     odev_id: int,
     odev_update: schemas.OdevUpdate,
-    db: Session = Depends(database.get_db),
-    current_ogrenci: int = Depends(get_current_ogrenci)
+    db: AsyncSession = Depends(database.get_async_db),
+    current_ogrenci_id: int = Depends(get_current_ogrenci)
 ):
     """Öğrenci ödev durumunu günceller"""
-    odev = crud.get_odev_by_id(db, odev_id)
+    odev = await crud_async.get_odev_by_id(db, odev_id)
     if not odev:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -136,11 +207,10 @@ def update_odev_durumu(
         )
     
     # Ödevin bu öğrenciye ait olduğunu kontrol et
-    ogrenci = crud.get_ogrenci_by_no(db, current_ogrenci)
-    if odev.ogrenci_id != ogrenci.id:
+    if odev.ogrenci_id != current_ogrenci_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bu ödevi güncelleme yetkiniz yok"
         )
     
-    return crud.update_odev_durumu(db, odev_id, odev_update) 
\ No newline at end of file
+    return await crud_async.update_odev_durumu(db, odev_id, odev_update) 
\ No newline at end of file
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from enum import Enum
 
 # 🟢 Koç Şemaları
@@ -15,11 +15,12 @@ class KocCreate(KocBase):
 
 class Koc(KocBase):
     id: int
-    created_at: datetime
+    # Migrasyon 8'den önce eklenen kayıtlarda boştur
+    uzmanlik: Optional[str] = None
+    created_at: Optional[datetime] = None
     ogrenciler: List['Ogrenci'] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class KocLogin(BaseModel):
     email: str
@@ -33,6 +34,7 @@ class OdevDurum(str, Enum):
     BEKLEMEDE = "beklemede"
     TAMAMLANDI = "tamamlandi"
     REDDEDILDI = "reddedildi"
+    GECIKTI = "gecikti"
 
 class OgrenciBase(BaseModel):
     ad: str
@@ -43,6 +45,15 @@ class OgrenciBase(BaseModel):
 class OgrenciCreate(OgrenciBase):
     sifre: str
 
+class OgrenciImportHata(BaseModel):
+    satir: int
+    ogrenci_no: Optional[str] = None
+    hata: str
+
+class OgrenciImportSonuc(BaseModel):
+    eklenen: int
+    hatalar: List[OgrenciImportHata] = []
+
 class OgrenciLogin(BaseModel):
     ogrenci_no: str
     sifre: str
@@ -50,10 +61,11 @@ class OgrenciLogin(BaseModel):
 class Ogrenci(OgrenciBase):
     id: int
     koc_id: Optional[int] = None
-    olusturma_tarihi: datetime
+    # Migrasyon 8'den önce eklenen kayıtlarda boştur
+    sinif: Optional[int] = None
+    olusturma_tarihi: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class OdevBase(BaseModel):
     baslik: str
@@ -64,6 +76,30 @@ class OdevCreate(OdevBase):
     ogrenci_id: int
     koc_id: int
 
+class OdevTopluCreate(OdevBase):
+    ogrenci_idler: List[int] = []
+    tum_ogrenciler: bool = False  # True ise koçun tüm öğrencilerine atanır
+
+class OdevTopluDurumUpdate(BaseModel):
+    idler: List[int]
+    durum: OdevDurum
+
+class OdevTopluDurumSonuc(BaseModel):
+    guncellenen: List[int] = []
+    bulunamayan: List[int] = []
+    yetkisiz: List[int] = []
+
+class OgrenciOdevOzet(BaseModel):
+    ogrenci_id: int
+    durumlar: Dict[str, int] = {}
+    geciken: int = 0
+
+class KocOdevOzet(BaseModel):
+    koc_id: int
+    toplam: Dict[str, int] = {}
+    geciken: int = 0
+    ogrenciler: List[OgrenciOdevOzet] = []
+
 class OdevUpdate(BaseModel):
     durum: OdevDurum
 
@@ -74,12 +110,30 @@ class Odev(OdevBase):
     ogrenci_id: int
     koc_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class OdevResponse(Odev):
     pass
 
+class OdevTopluSonuc(BaseModel):
+    odevler: List[Odev] = []
+    bulunamayan: List[int] = []
+    yetkisiz: List[int] = []
+
+# Listelerde ozet=true ile dönen, uzun metin alanları olmayan görünüm
+class OdevOzet(BaseModel):
+    id: int
+    baslik: str
+    teslim_tarihi: datetime
+    durum: OdevDurum
+    ogrenci_id: int
+    koc_id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class OdevAramaSonucu(OdevOzet):
+    skor: float
+
 # Koç-Öğrenci ilişkisi için şemalar
 class OgrenciKocEkle(BaseModel):
     ogrenci_id: int
@@ -87,14 +141,20 @@ class OgrenciKocEkle(BaseModel):
 class OgrenciKocCikar(BaseModel):
     ogrenci_id: int
 
+# Otomatik tamamlama önerisi
+class OgrenciOneri(BaseModel):
+    id: int
+    ogrenci_no: Optional[str] = None
+    ad: Optional[str] = None
+    soyad: Optional[str] = None
+
 class OgrenciKocListe(BaseModel):
     id: int
     ad: str
     soyad: str
     ogrenci_no: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     access_token: str
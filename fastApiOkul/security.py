@@ -1,8 +1,15 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
 
 # JWT ayarları
@@ -22,6 +29,78 @@ def verify_password(plain_password: str, hashed_password: str):
 def get_password_hash(password: str):
     return pwd_context.hash(password)
 
+# bcrypt hesaplamaları ~250 ms CPU harcar ve GIL'i tutar; bu yüzden request
+# threadpool'u yerine çekirdek sayısı kadar process'ten oluşan ayrı bir havuzda
+# çalıştırılır. Kuyruk dolduğunda istek bekletilmez, hemen 503 döner.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", os.cpu_count() or 1))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", HASH_WORKERS * 8))
+
+class HashExecutor:
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.bekleyen = 0
+        self.reddedilen = 0
+        self.tamamlanan = 0
+        self.sureler = deque(maxlen=1000)
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def run(self, fn, *args, olc: bool = True):
+        """fn'i havuzda çalıştırır. olc=False ise süre gecikme yüzdeliklerine girmez
+        (tek bir login/kayıt hash'i olmayan toplu işler için)."""
+        # Sayaçlar yalnızca event loop thread'inden değiştirildiği için kilit gerekmez
+        if self.bekleyen >= self.queue_size:
+            self.reddedilen += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Sunucu şu anda meşgul, lütfen tekrar deneyin",
+                headers={"Retry-After": "1"},
+            )
+        self.bekleyen += 1
+        baslangic = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        finally:
+            self.bekleyen -= 1
+            self.tamamlanan += 1
+            if olc:
+                self.sureler.append(time.perf_counter() - baslangic)
+
+    def metrics(self):
+        sureler = sorted(self.sureler)
+        def yuzdelik(p):
+            if not sureler:
+                return None
+            return round(sureler[min(len(sureler) - 1, int(len(sureler) * p))] * 1000, 2)
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queue_depth": self.bekleyen,
+            "completed": self.tamamlanan,
+            "rejected": self.reddedilen,
+            "latency_p50_ms": yuzdelik(0.50),
+            "latency_p99_ms": yuzdelik(0.99),
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+hash_executor = HashExecutor(HASH_WORKERS, HASH_QUEUE_SIZE)
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await hash_executor.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str):
+    return await hash_executor.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -32,20 +111,74 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(security)):
+# Doğrulanmış token önbelleği: aynı token'la gelen tekrar isteklerde imza
+# doğrulaması ve claim ayrıştırması atlanır. Anahtar token'ın SHA-256 özeti,
+# değer (kullanıcı id, exp) ikilisidir; kayıt en geç token'ın exp anında düşer.
+# Geçersiz token'lar önbelleğe alınmaz, her seferinde yeniden doğrulanır.
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 10000))
+
+class TokenCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hit = 0
+        self.miss = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = self._key(token)
+        with self._lock:
+            kayit = self._data.get(key)
+            if kayit is not None:
+                user_id, exp = kayit
+                if time.time() < exp:
+                    self._data.move_to_end(key)
+                    self.hit += 1
+                    return user_id
+                del self._data[key]
+            self.miss += 1
+            return None
+
+    def set(self, token: str, user_id: int, exp: float):
+        key = self._key(token)
+        with self._lock:
+            self._data[key] = (user_id, exp)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def metrics(self):
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hit": self.hit, "miss": self.miss}
+
+token_cache = TokenCache(JWT_CACHE_SIZE)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Geçersiz kimlik bilgileri",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    token = credentials.credentials
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-        return int(user_id)
-    except JWTError:
+        user_id = int(user_id)
+    except (JWTError, ValueError):
         raise credentials_exception
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(token, user_id, float(exp))
+    return user_id
 
 async def get_current_koc(current_user: int = Depends(get_current_user)):
     return current_user
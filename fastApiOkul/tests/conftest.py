@@ -0,0 +1,62 @@
+"""Testler geçici bir SQLite veritabanında çalışır.
+
+database.py engine'leri import anında kurduğu için ortam değişkenleri
+uygulama modülleri import edilmeden önce ayarlanır. Şema üretimdeki gibi
+migrasyonlar.upgrade() ile kurulur.
+"""
+import os
+import sys
+import tempfile
+
+_DIZIN = tempfile.mkdtemp(prefix="okul_test_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DIZIN}/test.db"
+os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_DIZIN}/test.db"
+os.environ["STARTUP_WARMUP"] = "0"
+os.environ["SWEEPER_INTERVAL"] = "0"
+os.environ["OGRENCI_INDEKS_INTERVAL"] = "0"
+os.environ.pop("ASYNC_REPLICA_URLS", None)
+os.environ.pop("ENTITY_CACHE_URL", None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+import entity_cache
+import migrasyonlar
+import models
+from security import create_access_token, hash_executor
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sema():
+    migrasyonlar.upgrade()
+    yield
+    # aiosqlite bağlantı thread'leri ve bcrypt process'leri açık kalırsa pytest kapanmaz
+    asyncio.run(database.async_engine.dispose())
+    database.engine.dispose()
+    hash_executor.shutdown()
+
+
+@pytest.fixture
+def bos_db():
+    """Tabloları ve süreç içi önbelleği boşaltır; odevler_fts trigger'larla birlikte temizlenir"""
+    with database.engine.begin() as conn:
+        for tablo in reversed(models.Base.metadata.sorted_tables):
+            conn.execute(tablo.delete())
+    # SQLite boşalan tabloda id'leri yeniden kullanır; eski kayıtlar önbellekten dönmesin
+    entity_cache.entity_cache.local = entity_cache.LocalBackend(entity_cache.ENTITY_CACHE_SIZE)
+    return database.engine
+
+
+@pytest.fixture
+def client():
+    from main import app
+    with TestClient(app) as c:
+        yield c
+
+
+def yetki(kullanici_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(kullanici_id)})}"}
@@ -0,0 +1,45 @@
+"""Silme sonrası eski değerin önbelleğe geri yazılmaması."""
+import asyncio
+
+import entity_cache
+from entity_cache import EntityCache, LocalBackend
+
+
+def _model(deger):
+    return {"deger": deger}
+
+
+def test_yavas_yukleme_silmeden_sonra_eski_degeri_yazmaz(monkeypatch):
+    monkeypatch.setattr(entity_cache, "ENTITY_CACHE_TOMBSTONE_TTL", 0.05)
+    cache = EntityCache(LocalBackend(10))
+
+    async def senaryo():
+        async def yavas():
+            # Satır okundu, ardından güncellendi ve önbellek silindi; yükleme mezardan uzun sürdü
+            await cache.invalidate("odev", 1)
+            await asyncio.sleep(0.1)
+            return _model("eski")
+
+        assert await cache.get_or_load("odev", 1, yavas) == b'{"deger":"eski"}'
+
+        async def taze():
+            return _model("yeni")
+
+        return await cache.get_or_load("odev", 1, taze)
+
+    assert asyncio.run(senaryo()) == b'{"deger":"yeni"}'
+    assert cache.metrics()["slow_load"] == 1
+
+
+def test_mezar_suresince_eski_deger_yazilmaz():
+    cache = EntityCache(LocalBackend(10))
+
+    async def senaryo():
+        async def yukle():
+            await cache.invalidate("odev", 1)
+            return _model("eski")
+
+        await cache.get_or_load("odev", 1, yukle)
+        return await cache.local.get("odev:1")
+
+    assert asyncio.run(senaryo()) == entity_cache.MEZAR
@@ -0,0 +1,90 @@
+"""GET /api/koc-odevler/ara: SQLite FTS5 yolu (migrasyon 3 ile kurulur)."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, update
+
+import models
+from conftest import yetki
+
+
+def _odevler(engine, *satirlar):
+    """(id, koc_id, baslik, aciklama) satırlarını ekler"""
+    with engine.begin() as conn:
+        conn.execute(insert(models.Odev), [
+            {"id": i, "koc_id": koc_id, "ogrenci_id": 1, "baslik": baslik, "aciklama": aciklama,
+             "teslim_tarihi": datetime(2030, 1, 1), "durum": "beklemede"}
+            for i, koc_id, baslik, aciklama in satirlar
+        ])
+
+
+def _ara(client, q, koc_id=1, **params):
+    response = client.get("/api/koc-odevler/ara", params={"q": q, **params}, headers=yetki(koc_id))
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _idler(response):
+    return [o["id"] for o in response.json()]
+
+
+def test_baslikta_gecen_once_gelir(client, bos_db):
+    _odevler(
+        bos_db,
+        (1, 1, "Fizik tekrarı", "Kesirler konusuna da bakılacak"),
+        (2, 1, "Kesirler çalışma kağıdı", "Sayfa 12"),
+        (3, 1, "Geometri", "Açılar"),
+    )
+    response = _ara(client, "kesirler")
+    assert _idler(response) == [2, 1]
+    skorlar = [o["skor"] for o in response.json()]
+    assert skorlar[0] > skorlar[1]
+
+
+def test_yalnizca_kocun_odevleri(client, bos_db):
+    _odevler(bos_db, (1, 1, "Kesirler", ""), (2, 2, "Kesirler", ""))
+    assert _idler(_ara(client, "kesirler", koc_id=1)) == [1]
+    assert _idler(_ara(client, "kesirler", koc_id=2)) == [2]
+    assert _idler(_ara(client, "kesirler", koc_id=3)) == []
+
+
+def test_cursor_ile_sonraki_sayfalar(client, bos_db):
+    # Eşit skorlu satırlar id ile ayrışır; hiçbiri atlanmaz ya da tekrarlanmaz
+    _odevler(bos_db, *[(i, 1, "Paragraf sorusu", "") for i in range(1, 8)], (8, 1, "Paragraf", "Paragraf"))
+    gorulen = []
+    params = {"limit": 3}
+    for _ in range(10):
+        response = _ara(client, "paragraf", **params)
+        gorulen += _idler(response)
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert gorulen[0] == 8
+    assert sorted(gorulen) == list(range(1, 9))
+    assert len(gorulen) == len(set(gorulen))
+
+
+def test_son_sayfada_cursor_yok(client, bos_db):
+    _odevler(bos_db, (1, 1, "Paragraf", ""), (2, 1, "Paragraf", ""))
+    assert "X-Next-Cursor" not in _ara(client, "paragraf", limit=5).headers
+
+
+@pytest.mark.parametrize("kolon", ["baslik", "aciklama"])
+def test_guncelleme_ve_silme_fts_tablosuna_yansir(client, bos_db, kolon):
+    _odevler(bos_db, (1, 1, "Kesirler", "Kesirler"), (2, 1, "Oran orantı", ""))
+    # Yalnızca tek kolon değişir; diğeri eski kelimeyi taşımaya devam eder
+    with bos_db.begin() as conn:
+        conn.execute(update(models.Odev).where(models.Odev.id == 1).values({kolon: "Denklemler"}))
+    assert _idler(_ara(client, "denklemler")) == [1]
+    assert _idler(_ara(client, "kesirler")) == [1]
+
+    with bos_db.begin() as conn:
+        conn.execute(update(models.Odev).where(models.Odev.id == 1).values(baslik="Üslü", aciklama="Sayılar"))
+    assert _idler(_ara(client, "kesirler")) == []
+    assert _idler(_ara(client, "denklemler")) == []
+    assert _idler(_ara(client, "üslü")) == [1]
+
+    with bos_db.begin() as conn:
+        conn.execute(models.Odev.__table__.delete().where(models.Odev.id == 1))
+    assert _idler(_ara(client, "üslü")) == []
+    assert _idler(_ara(client, "oran")) == [2]
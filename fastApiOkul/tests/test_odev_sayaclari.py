@@ -0,0 +1,74 @@
+"""Koç panosu sayaçları ödev yazımları ve koç/öğrenci silmeyle tutarlı kalır."""
+import asyncio
+
+from sqlalchemy import insert, select
+
+import database
+import models
+import odev_sayaclari
+from conftest import yetki
+
+
+def _seed(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(models.Koc), [
+            {"id": k, "email": f"koc{k}@okul.com.tr", "ad": "Koç", "soyad": str(k), "sifre_hash": "x"}
+            for k in (1, 2)
+        ])
+        conn.execute(insert(models.Ogrenci), [
+            {"id": i, "ogrenciNo": str(i), "ad": "Öğrenci", "soyad": str(i),
+             "email": f"ogr{i}@okul.com.tr", "sifre_hash": "x"}
+            for i in (1, 2)
+        ])
+
+
+def _odev(client, koc_id, ogrenci_id):
+    response = client.post("/api/odev", headers=yetki(koc_id), json={
+        "baslik": "Ödev", "aciklama": "Açıklama", "teslim_tarihi": "2030-01-01T00:00:00",
+        "koc_id": koc_id, "ogrenci_id": ogrenci_id,
+    })
+    assert response.status_code == 200, response.text
+
+
+def _sayaclar(engine):
+    with engine.connect() as conn:
+        return sorted(conn.execute(select(
+            models.OdevSayac.koc_id, models.OdevSayac.ogrenci_id, models.OdevSayac.durum, models.OdevSayac.sayi
+        ).filter(models.OdevSayac.sayi != 0)).all())
+
+
+def _rebuild():
+    async def calistir():
+        async with database.AsyncSessionLocal() as db:
+            await odev_sayaclari.rebuild(db)
+    asyncio.run(calistir())
+
+
+def test_ogrenci_silinince_sayaclari_duser(client, bos_db):
+    _seed(bos_db)
+    for koc_id, ogrenci_id in ((1, 1), (1, 1), (1, 2), (2, 1)):
+        _odev(client, koc_id, ogrenci_id)
+
+    response = client.delete("/api/ogrenci/1", headers=yetki(1))
+    assert response.status_code == 200, response.text
+
+    assert _sayaclar(bos_db) == [(1, 2, "beklemede", 1)]
+    ozet = client.get("/api/koc/1/ozet", headers=yetki(1)).json()
+    assert ozet["toplam"] == {"beklemede": 1}
+    assert [o["ogrenci_id"] for o in ozet["ogrenciler"]] == [2]
+    # Yeniden hesaplama artımlı sayaçlarla aynı sonucu verir
+    _rebuild()
+    assert _sayaclar(bos_db) == [(1, 2, "beklemede", 1)]
+
+
+def test_koc_silinince_sayaclari_duser(client, bos_db):
+    _seed(bos_db)
+    for koc_id, ogrenci_id in ((1, 1), (1, 2), (2, 1)):
+        _odev(client, koc_id, ogrenci_id)
+
+    response = client.delete("/api/koc/1", headers=yetki(1))
+    assert response.status_code == 200, response.text
+
+    assert _sayaclar(bos_db) == [(2, 1, "beklemede", 1)]
+    _rebuild()
+    assert _sayaclar(bos_db) == [(2, 1, "beklemede", 1)]
@@ -0,0 +1,45 @@
+"""POST /api/odev/toplu yalnızca çağıran koçun öğrencilerine ödev atar."""
+from sqlalchemy import insert, select
+
+import models
+from conftest import yetki
+
+ODEV = {"baslik": "Deneme", "aciklama": "Toplu atama", "teslim_tarihi": "2030-01-01T00:00:00"}
+
+
+def _seed(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(models.Koc), [
+            {"id": k, "email": f"koc{k}@okul.com.tr", "ad": "Koç", "soyad": str(k), "sifre_hash": "x"}
+            for k in (1, 2)
+        ])
+        conn.execute(insert(models.Ogrenci), [
+            {"id": i, "ogrenciNo": str(i), "ad": "Öğrenci", "soyad": str(i),
+             "email": f"ogr{i}@okul.com.tr", "sifre_hash": "x"}
+            for i in (1, 2, 3)
+        ])
+        conn.execute(insert(models.koc_ogrenci), [
+            {"koc_id": 1, "ogrenci_id": 1}, {"koc_id": 1, "ogrenci_id": 2}, {"koc_id": 2, "ogrenci_id": 3}
+        ])
+
+
+def test_baska_kocun_ogrencisine_atanmaz(client, bos_db):
+    _seed(bos_db)
+    response = client.post("/api/odev/toplu", json={**ODEV, "ogrenci_idler": [1, 3, 99]}, headers=yetki(1))
+    assert response.status_code == 200, response.text
+    sonuc = response.json()
+    assert [o["ogrenci_id"] for o in sonuc["odevler"]] == [1]
+    assert sonuc["yetkisiz"] == [3]
+    assert sonuc["bulunamayan"] == [99]
+    with bos_db.connect() as conn:
+        sayaclar = conn.execute(select(models.OdevSayac.koc_id, models.OdevSayac.ogrenci_id)).all()
+        sahipler = conn.execute(select(models.OdevVersiyon.sahip)).scalars().all()
+    assert sayaclar == [(1, 1)]
+    assert sorted(sahipler) == ["koc:1", "ogrenci:1"]
+
+
+def test_tum_ogrenciler(client, bos_db):
+    _seed(bos_db)
+    response = client.post("/api/odev/toplu", json={**ODEV, "tum_ogrenciler": True}, headers=yetki(1))
+    assert response.status_code == 200, response.text
+    assert sorted(o["ogrenci_id"] for o in response.json()["odevler"]) == [1, 2]
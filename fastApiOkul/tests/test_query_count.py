@@ -0,0 +1,65 @@
+"""GET /api/koclar ve /api/koc/{id} için istek başına SQL sayısı.
+
+Koc.ogrenciler route'ta toplu yüklendiği için sorgu sayısı sayfa boyutundan
+bağımsızdır: liste selectin ile 2 (koçlar + tek IN sorgusuyla öğrencileri),
+detay joined ile 1 ifadedir. Sayılar middleware'in X-DB-Query-Count
+header'ından okunur.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+import models
+
+KOC = 120
+KOC_BASINA_OGRENCI = 3
+
+
+@pytest.fixture
+def koclar(bos_db):
+    simdi = datetime.utcnow()
+    ogrenci_sayisi = KOC * KOC_BASINA_OGRENCI
+    with bos_db.begin() as conn:
+        conn.execute(insert(models.Koc), [
+            {"id": i, "email": f"koc{i:03d}@okul.com.tr", "ad": "Koç", "soyad": str(i),
+             "uzmanlik": "Matematik", "created_at": simdi, "sifre_hash": "x"}
+            for i in range(1, KOC + 1)
+        ])
+        conn.execute(insert(models.Ogrenci), [
+            {"id": i, "ogrenciNo": str(i), "ad": "Öğrenci", "soyad": str(i), "email": f"ogr{i}@okul.com.tr",
+             "sinif": 9, "olusturma_tarihi": simdi, "sifre_hash": "x", "koc_id": 1 + i % KOC}
+            for i in range(1, ogrenci_sayisi + 1)
+        ])
+        conn.execute(insert(models.koc_ogrenci), [
+            {"koc_id": 1 + i % KOC, "ogrenci_id": i} for i in range(1, ogrenci_sayisi + 1)
+        ])
+    return KOC
+
+
+def _sorgu_sayisi(response):
+    assert response.status_code == 200, response.text
+    return int(response.headers["X-DB-Query-Count"])
+
+
+@pytest.mark.parametrize("limit", [1, 10, 100])
+def test_koclar_sorgu_sayisi_sayfa_boyutundan_bagimsiz(client, koclar, limit):
+    response = client.get("/api/koclar", params={"limit": limit})
+    assert len(response.json()) == limit
+    assert all(len(k["ogrenciler"]) == KOC_BASINA_OGRENCI for k in response.json())
+    assert _sorgu_sayisi(response) == 2
+
+
+def test_koclar_cursor_sayfasi_sorgu_sayisi(client, koclar):
+    ilk = client.get("/api/koclar", params={"limit": 100})
+    response = client.get("/api/koclar", params={"limit": 100, "cursor": ilk.headers["X-Next-Cursor"]})
+    assert len(response.json()) == koclar - 100
+    # Son sayfa: keyset sorgusu, NULL email sorgusu ve öğrenciler
+    assert _sorgu_sayisi(response) <= 3
+
+
+def test_koc_detay_tek_sorgu(client, koclar):
+    response = client.get("/api/koc/7")
+    assert response.json()["uzmanlik"] == "Matematik"
+    assert len(response.json()["ogrenciler"]) == KOC_BASINA_OGRENCI
+    assert _sorgu_sayisi(response) == 1